@@ -7,23 +7,136 @@ Tracks checkpoint creation, validity, consumption, and expiry.
 
 from __future__ import annotations
 
+import atexit
 import errno as _errno_mod
 import fnmatch
+import functools
+import heapq
+import itertools
 import json
 import logging
 import os
-import tempfile
+import re
+import sys
 import threading
+import time
+import weakref
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar, Final
+
+from ..utils import json_codec
+
+try:
+    from ciso8601 import (  # type: ignore[import-not-found]
+        parse_datetime as _fromisoformat,
+    )
+except ImportError:  # pragma: no cover - exercised when ciso8601 is absent
+    _fromisoformat = datetime.fromisoformat
 
 # Platform-portable ELOOP errno values (Linux=40, macOS/BSD=62).
-_ELOOP_ERRNOS: set[int] = {getattr(_errno_mod, "ELOOP", 40), 62}
+_ELOOP_ERRNOS: Final[frozenset[int]] = frozenset({getattr(_errno_mod, "ELOOP", 40), 62})
 
 logger = logging.getLogger(__name__)
 
+# Trackers with a deferred state write pending (see ``persist_delay``).
+# Held weakly and flushed by one shared atexit hook, so registering does
+# not keep a tracker (or its history) alive.
+_pending_flush: weakref.WeakSet[CheckpointTracker] = weakref.WeakSet()
+
+
+def _flush_pending() -> None:
+    """Write deferred state for every tracker that still has some pending."""
+    for tracker in list(_pending_flush):
+        tracker.flush()
+
+
+atexit.register(_flush_pending)
+
+_O_NOFOLLOW: Final[int] = getattr(os, "O_NOFOLLOW", 0)
+
+_UTC: Final = timezone.utc
+
+
+@functools.lru_cache(maxsize=16)
+def _minutes_delta(minutes: int) -> timedelta:
+    """Shared immutable ``timedelta`` for an expiry of *minutes*."""
+    return timedelta(minutes=minutes)
+
+
+# Scope lists with at least this many globs are matched with one union
+# regex instead of one regex per pattern.
+_UNION_SCOPE_THRESHOLD: Final = 4
+
+# (scope list, has "*", exact patterns, compiled glob matchers)
+_ScopePlan = tuple[list[str], bool, frozenset[str], tuple[Callable[[str], Any], ...]]
+
+
+@functools.lru_cache(maxsize=256)
+def _scope_matchers(
+    scope: tuple[str, ...],
+) -> tuple[bool, frozenset[str], tuple[Callable[[str], Any], ...]]:
+    """Translate scope globs to compiled regexes, shared across checkpoints.
+
+    Sessions reuse the same few scope lists for many checkpoints, so the
+    compiled form is cached by scope contents rather than per checkpoint.
+    Same semantics as fnmatch.fnmatch(), minus its per-call translate and
+    cache lookup.  Long scope lists are joined into a single alternation so
+    a target costs one regex call instead of N; short lists keep one small
+    regex per pattern.
+    """
+    regexes = [fnmatch.translate(os.path.normcase(p)) for p in scope if p != "*"]
+    if len(regexes) >= _UNION_SCOPE_THRESHOLD:
+        union = "|".join(f"(?:{r})" for r in regexes)
+        matchers: tuple[Callable[[str], Any], ...] = (re.compile(union).match,)
+    else:
+        matchers = tuple(re.compile(r).match for r in regexes)
+    return "*" in scope, frozenset(scope), matchers
+
+
+def _create_tmp(path: str) -> int:
+    """Exclusively create the fixed temp file *path* and return its fd.
+
+    Tracker temp files have a fixed per-instance name (no mkstemp name
+    search); O_EXCL + O_NOFOLLOW keep a predictable name from being
+    hijacked.  A leftover from an interrupted write is removed and the
+    create retried once.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_NOFOLLOW
+    try:
+        return os.open(path, flags, 0o600)
+    except FileExistsError:
+        os.unlink(path)
+        return os.open(path, flags, 0o600)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_iso(value: str) -> datetime:
+    """Cached ISO-8601 parse (``ciso8601`` when installed).
+
+    Loaded history repeats timestamps (e.g. shared expiry seconds, archive
+    re-reads); datetimes are immutable, so equal strings can share one.
+    """
+    parsed: datetime = _fromisoformat(value)
+    return parsed
+
+
+def _intern(value: str) -> str:
+    """Intern *value* so repeated scopes/reasons share one string object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_scope(scope: list[str]) -> list[str]:
+    """Copy *scope* with interned patterns.
+
+    Sessions reuse a handful of scope patterns (``"*"``, ``"src/*.py"``)
+    across hundreds of checkpoints; interning keeps one string per pattern
+    and lets equality checks short-circuit on identity.
+    """
+    return [_intern(p) for p in scope]
+
 
 @dataclass(slots=True)
 class Checkpoint:
@@ -42,28 +155,138 @@ class Checkpoint:
     consumed: bool = False
     consumed_at: datetime | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    # (created_at, expires_at, consumed_at, *their isoformat strings*),
+    # reused by to_dict() while the datetime objects are unchanged.
+    _iso_cache: tuple[Any, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # (id, reason, created_at, expires_at, consumed_at, consumed, metadata,
+    # copy of scope, encoded JSON bytes) for checkpoints with empty metadata;
+    # see _encoded().
+    _json_cache: (
+        tuple[
+            str,
+            str,
+            datetime,
+            datetime | None,
+            datetime | None,
+            bool,
+            dict[str, Any],
+            list[str],
+            bytes,
+        ]
+        | None
+    ) = field(default=None, init=False, repr=False, compare=False)
+    # Built lazily by matches_scope(); rebuilt if ``scope`` is reassigned.
+    _scope_plan: _ScopePlan | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # (created_at, expires_at, created epoch, expires epoch); see _epoch().
+    _ts_cache: tuple[Any, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _epoch(self) -> tuple[Any, ...]:
+        """Return the ``_ts_cache`` tuple, refreshing it if stale.
+
+        Validity checks and the marker file need unix timestamps; caching
+        them avoids tz-aware ``datetime`` construction and ``timestamp()``
+        conversion on each check.  Keyed on the identity of the datetime
+        fields, so direct reassignment (e.g. adjusting ``expires_at``) is
+        picked up.
+        """
+        cache = self._ts_cache
+        created_at = self.created_at
+        expires_at = self.expires_at
+        if cache is None or cache[0] is not created_at or cache[1] is not expires_at:
+            cache = self._ts_cache = (
+                created_at,
+                expires_at,
+                created_at.timestamp(),
+                expires_at.timestamp() if expires_at else None,
+            )
+        return cache
 
     def is_valid(self) -> bool:
         """Check if checkpoint is still valid (not consumed, not expired)."""
         if self.consumed:
             return False
-        if self.expires_at and datetime.now(timezone.utc) > self.expires_at:
+        if self.expires_at and time.time() > self._epoch()[3]:
             return False
         return True
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize checkpoint to a JSON-compatible dict."""
+        created_at = self.created_at
+        expires_at = self.expires_at
+        consumed_at = self.consumed_at
+        cache = self._iso_cache
+        # The whole history is re-serialized on every persist; only format
+        # timestamps again when one of the datetime fields was reassigned.
+        if (
+            cache is None
+            or cache[0] is not created_at
+            or cache[1] is not expires_at
+            or cache[2] is not consumed_at
+        ):
+            cache = self._iso_cache = (
+                created_at,
+                expires_at,
+                consumed_at,
+                created_at.isoformat(),
+                expires_at.isoformat() if expires_at else None,
+                consumed_at.isoformat() if consumed_at else None,
+            )
         return {
             "id": self.id,
             "scope": self.scope,
             "reason": self.reason,
-            "created_at": self.created_at.isoformat(),
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "created_at": cache[3],
+            "expires_at": cache[4],
             "consumed": self.consumed,
-            "consumed_at": self.consumed_at.isoformat() if self.consumed_at else None,
+            "consumed_at": cache[5],
             "metadata": self.metadata,
         }
 
+    def _encoded(self) -> bytes:
+        """Return this checkpoint's JSON encoding for the state file.
+
+        History entries are effectively immutable once recorded, so the
+        bytes are reused across persists until any serialized field is
+        reassigned or ``scope`` is edited in place.  Only checkpoints with
+        empty metadata are cached, and only while it stays empty, since the
+        dict may be mutated in place.
+        """
+        cache = self._json_cache
+        if (
+            cache is not None
+            and cache[0] is self.id
+            and cache[1] is self.reason
+            and cache[2] is self.created_at
+            and cache[3] is self.expires_at
+            and cache[4] is self.consumed_at
+            and cache[5] is self.consumed
+            and cache[6] is self.metadata
+            and not self.metadata
+            # Interned patterns make this mostly identity comparisons.
+            and cache[7] == self.scope
+        ):
+            return cache[8]
+        data = json_codec.dumps(self.to_dict())
+        if not self.metadata:
+            self._json_cache = (
+                self.id,
+                self.reason,
+                self.created_at,
+                self.expires_at,
+                self.consumed_at,
+                self.consumed,
+                self.metadata,
+                list(self.scope),
+                data,
+            )
+        return data
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Checkpoint:
         """Deserialize checkpoint from a dict.
@@ -72,51 +295,64 @@ class Checkpoint:
             ValueError: If required fields have wrong types.
             KeyError: If required fields are missing.
         """
-        # Validate types to catch crafted/corrupt state files early.
-        if not isinstance(data.get("id"), str):
+        # Validate types to catch crafted/corrupt state files early.  Each
+        # field is looked up once; exact type checks suffice for JSON input.
+        checkpoint_id = data.get("id")
+        if type(checkpoint_id) is not str:
             raise ValueError("checkpoint id must be a string")
-        if not isinstance(data.get("scope"), list):
+        raw_scope = data.get("scope")
+        if type(raw_scope) is not list:
             raise ValueError("checkpoint scope must be a list")
-        if not all(isinstance(s, str) for s in data["scope"]):
-            raise ValueError("checkpoint scope elements must be strings")
-        if not isinstance(data.get("reason"), str):
+        try:
+            # sys.intern() only accepts exact str, doubling as the check.
+            scope = [sys.intern(s) for s in raw_scope]
+        except TypeError:
+            raise ValueError("checkpoint scope elements must be strings") from None
+        reason = data.get("reason")
+        if type(reason) is not str:
             raise ValueError("checkpoint reason must be a string")
-        if "created_at" not in data:
+        created_at = data.get("created_at")
+        if created_at is None and "created_at" not in data:
             raise ValueError("checkpoint created_at is required")
-        if not isinstance(data.get("consumed", False), bool):
+        consumed = data.get("consumed", False)
+        if type(consumed) is not bool:
             raise ValueError("checkpoint consumed must be a boolean")
         meta = data.get("metadata", {})
-        if not isinstance(meta, dict):
+        if type(meta) is not dict:
             raise ValueError("checkpoint metadata must be a dict")
+        expires_at = data.get("expires_at")
+        consumed_at = data.get("consumed_at")
 
         return cls(
-            id=data["id"],
-            scope=data["scope"],
-            reason=data["reason"],
-            created_at=datetime.fromisoformat(data["created_at"]),
-            expires_at=(
-                datetime.fromisoformat(data["expires_at"])
-                if data.get("expires_at")
-                else None
-            ),
-            consumed=data.get("consumed", False),
-            consumed_at=(
-                datetime.fromisoformat(data["consumed_at"])
-                if data.get("consumed_at")
-                else None
-            ),
+            id=checkpoint_id,
+            scope=scope,
+            reason=sys.intern(reason),
+            created_at=_parse_iso(created_at),
+            expires_at=_parse_iso(expires_at) if expires_at else None,
+            consumed=consumed,
+            consumed_at=_parse_iso(consumed_at) if consumed_at else None,
             metadata=meta,
         )
 
+    def _compile_scope(self) -> _ScopePlan:
+        """Build this checkpoint's scope plan from the shared matcher cache."""
+        scope = self.scope
+        wildcard, exact, matchers = _scope_matchers(tuple(scope))
+        plan = (scope, wildcard, exact, matchers)
+        self._scope_plan = plan
+        return plan
+
     def matches_scope(self, target: str) -> bool:
         """Check if target is covered by this checkpoint's scope."""
-        for scope_pattern in self.scope:
-            if scope_pattern == "*":
-                return True
-            if scope_pattern == target:
-                return True
-            # Use fnmatch for proper glob pattern matching
-            if fnmatch.fnmatch(target, scope_pattern):
+        plan = self._scope_plan
+        if plan is None or plan[0] is not self.scope:
+            plan = self._compile_scope()
+        _, wildcard, exact, matchers = plan
+        if wildcard or target in exact:
+            return True
+        target = os.path.normcase(target)
+        for match in matchers:
+            if match(target):
                 return True
         return False
 
@@ -161,15 +397,21 @@ class CheckpointTracker:
     expires_at, consumed, consumed_at, metadata.
     """
 
-    DEFAULT_EXPIRY_MINUTES: int = 30
-    DEFAULT_MAX_HISTORY: int = 100
-    _MAX_STATE_FILE_BYTES: int = 10 * 1024 * 1024  # 10 MB
+    # ClassVar keeps these out of the instance layout, so the module stays
+    # compatible with ahead-of-time compilation (mypyc) of the hot checks.
+    DEFAULT_EXPIRY_MINUTES: ClassVar[int] = 30
+    DEFAULT_MAX_HISTORY: ClassVar[int] = 100
+    _MAX_STATE_FILE_BYTES: ClassVar[int] = 10 * 1024 * 1024  # 10 MB
+    # Upper bound on how long a positive validity check is reused (seconds).
+    _VALIDITY_CACHE_SECONDS: ClassVar[float] = 0.05
 
     def __init__(
         self,
         checkpoint_dir: str | Path = ".checkpoints",
         max_history: int | None = None,
         marker_dir: str | Path | None = None,
+        retain_consumed: bool = True,
+        persist_delay: float | None = None,
     ) -> None:
         """
         Initialize the tracker.
@@ -182,15 +424,68 @@ class CheckpointTracker:
                        If provided, create_checkpoint() writes .claude/checkpoint.ok
                        and consume_checkpoint() removes it, bridging the Python
                        tracker with the shell PreToolUse hook (SEC-001).
+            retain_consumed: Keep consumed checkpoints in history (default:
+                        True). Set False when the audit trail is not needed
+                        to skip the history append on every consume.
+            persist_delay: If set, coalesce state-file writes made within this
+                        many seconds into one deferred write (call flush() to
+                        force it). Trades losing at most the last burst of
+                        changes on a crash for fewer writes. Default: write
+                        synchronously on every change.
         """
         self._checkpoint_dir = Path(checkpoint_dir)
         self._max_history = (
             max_history if max_history is not None else self.DEFAULT_MAX_HISTORY
         )
         self._marker_dir = Path(marker_dir) if marker_dir is not None else None
+        self._retain_consumed = retain_consumed
+        # Marker fallback expiry for checkpoints without expires_at.
+        self._default_expiry_seconds: int = self.DEFAULT_EXPIRY_MINUTES * 60
+        # Precomputed str paths for the raw os.* calls in the marker methods.
+        self._marker_dir_str: str | None = (
+            str(self._marker_dir) if self._marker_dir is not None else None
+        )
+        self._marker_path_str: str | None = (
+            str(self._marker_dir / "checkpoint.ok")
+            if self._marker_dir is not None
+            else None
+        )
+        # Fixed temp names (unique per process and instance) for the
+        # write-to-tmp + rename sequences; see _create_tmp().
+        tmp_suffix = f".{os.getpid()}.{id(self):x}.tmp"
+        self._state_path_str = str(self._checkpoint_dir / "tracker_state.json")
+        self._state_tmp_str = self._state_path_str + tmp_suffix
+        self._marker_tmp_str: str | None = (
+            self._marker_path_str + tmp_suffix
+            if self._marker_path_str is not None
+            else None
+        )
+        # Set once _write_marker() has created the marker directory, so later
+        # writes skip the mkdir/stat syscalls.
+        self._marker_dir_ready = False
+        # Checkpoint ID the marker file currently describes (None: absent),
+        # valid only while _marker_synced is True; see _sync_marker().
+        self._marker_id: str | None = None
+        self._marker_synced = False
         self._lock = threading.Lock()
         self._active_checkpoint: Checkpoint | None = None
         self._checkpoint_history: list[Checkpoint] = []
+        # ID -> checkpoint for the active checkpoint and every history entry.
+        self._by_id: dict[str, Checkpoint] = {}
+        # Monotonic-clock cache of the last positive validity check, keyed
+        # by checkpoint and ``expires_at`` identity (see _valid_active).
+        self._valid_cache_cp: Checkpoint | None = None
+        self._valid_cache_expires: datetime | None = None
+        self._valid_cache_until: float = 0.0
+        # True while history is sorted by created_at.  The tracker only ever
+        # moves its newest checkpoint into history, so this holds unless a
+        # loaded state file was out of order.
+        self._history_ordered = True
+        self._persist_delay = persist_delay
+        self._dirty = False
+        self._persist_timer: threading.Timer | None = None
+        # Bytes of the last successful state write, to skip no-op rewrites.
+        self._last_persisted: bytes | None = None
         self._load_persisted_state()
 
     # ------------------------------------------------------------------
@@ -202,36 +497,67 @@ class CheckpointTracker:
         return self._checkpoint_dir / "tracker_state.json"
 
     def _persist_state(self) -> None:
+        """Persist tracker state, deferring the write if persist_delay is set.
+
+        Caller must hold the lock.
+        """
+        if self._persist_delay is None:
+            self._persist_state_now()
+            return
+        self._dirty = True
+        if self._persist_timer is None:
+            timer = threading.Timer(self._persist_delay, self.flush)
+            timer.daemon = True
+            self._persist_timer = timer
+            _pending_flush.add(self)
+            timer.start()
+
+    def flush(self) -> None:
+        """Write any deferred state changes to disk immediately."""
+        with self._lock:
+            if self._persist_timer is not None:
+                self._persist_timer.cancel()
+                self._persist_timer = None
+            if self._dirty:
+                self._persist_state_now()
+            _pending_flush.discard(self)
+
+    def _persist_state_now(self) -> None:
         """Atomically write tracker state to disk.
 
         Uses write-to-tmp + rename for crash safety.
         """
+        self._dirty = False
         try:
-            self._checkpoint_dir.mkdir(parents=True, exist_ok=True)
-            state = {
-                "active": (
-                    self._active_checkpoint.to_dict()
-                    if self._active_checkpoint
-                    else None
-                ),
-                # Cap history before serializing to prevent unbounded file growth.
-                "history": [
-                    c.to_dict() for c in self._checkpoint_history[-self._max_history :]
-                ],
-            }
-            state_path = self._state_file_path()
-            fd, tmp_path = tempfile.mkstemp(
-                dir=str(self._checkpoint_dir), suffix=".tmp"
+            # Assembled from per-checkpoint encodings (cached for unchanged
+            # history entries) rather than re-encoding the whole state;
+            # the layout matches json.dumps({"active": ..., "history": [...]}).
+            active = (
+                self._active_checkpoint._encoded()
+                if self._active_checkpoint
+                else b"null"
+            )
+            # Cap history before serializing to prevent unbounded file growth.
+            history = b",".join(
+                c._encoded() for c in self._checkpoint_history[-self._max_history :]
             )
+            payload = b'{"active":' + active + b',"history":[' + history + b"]}"
+            if payload == self._last_persisted:
+                # Nothing changed since the last successful write.
+                return
+            self._checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._state_tmp_str
+            fd = _create_tmp(tmp_path)
             try:
                 try:
-                    f = os.fdopen(fd, "w", encoding="utf-8")
+                    f = os.fdopen(fd, "wb")
                 except Exception:
                     os.close(fd)
                     raise
                 with f:
-                    json.dump(state, f)
-                os.replace(tmp_path, str(state_path))
+                    f.write(payload)
+                os.replace(tmp_path, self._state_path_str)
+                self._last_persisted = payload
             except Exception:
                 # Clean up temp file on failure; re-raise original error.
                 try:
@@ -265,7 +591,7 @@ class CheckpointTracker:
                     return
                 raise
             try:
-                f = os.fdopen(fd, encoding="utf-8")
+                f = os.fdopen(fd, "rb")
             except Exception:
                 os.close(fd)
                 raise
@@ -276,7 +602,7 @@ class CheckpointTracker:
                 )
                 return
             try:
-                f = open(state_path, encoding="utf-8")
+                f = open(state_path, "rb")
             except FileNotFoundError:
                 return
         try:
@@ -290,15 +616,29 @@ class CheckpointTracker:
                     )
                     return
                 raw = f.read()
-            state = json.loads(raw)
-            if state.get("active"):
-                self._active_checkpoint = Checkpoint.from_dict(state["active"])
+            state = json_codec.loads(raw)
+            # Release the file buffer before materializing checkpoints.
+            del raw
+            active = state.get("active")
+            if active:
+                self._active_checkpoint = Checkpoint.from_dict(active)
+            history = state.get("history", [])
+            if type(history) is not list:
+                raise ValueError("state history must be a list")
             # Cap loaded history to _max_history to prevent unbounded growth
-            # from a crafted or accumulated state file.
+            # from a crafted or accumulated state file; islice avoids copying
+            # the parsed list just to truncate it.
             self._checkpoint_history = [
                 Checkpoint.from_dict(entry)
-                for entry in state.get("history", [])[: self._max_history]
+                for entry in itertools.islice(history, self._max_history)
             ]
+            self._by_id = {c.id: c for c in self._checkpoint_history}
+            if self._active_checkpoint is not None:
+                self._by_id[self._active_checkpoint.id] = self._active_checkpoint
+            self._history_ordered = all(
+                a.created_at <= b.created_at
+                for a, b in itertools.pairwise(self._checkpoint_history)
+            )
         except (
             json.JSONDecodeError,
             KeyError,
@@ -311,6 +651,15 @@ class CheckpointTracker:
             # Start fresh — don't propagate corrupt state
             self._active_checkpoint = None
             self._checkpoint_history = []
+            self._by_id = {}
+            self._history_ordered = True
+
+    def _append_history(self, checkpoint: Checkpoint) -> None:
+        """Append *checkpoint* to history, noting if it breaks the ordering."""
+        history = self._checkpoint_history
+        if history and checkpoint.created_at < history[-1].created_at:
+            self._history_ordered = False
+        history.append(checkpoint)
 
     def create_checkpoint(
         self,
@@ -331,44 +680,46 @@ class CheckpointTracker:
         Returns:
             Checkpoint ID
         """
-        checkpoint_id = self._generate_checkpoint_id()
-
-        expires_at = None
-        if expiry_minutes is not None:
-            expires_at = datetime.now(timezone.utc) + timedelta(minutes=expiry_minutes)
-        elif self.DEFAULT_EXPIRY_MINUTES:
-            expires_at = datetime.now(timezone.utc) + timedelta(
-                minutes=self.DEFAULT_EXPIRY_MINUTES
+        with self._lock:
+            # Timestamps are taken under the lock so history insertion order
+            # matches creation order.
+            now = datetime.now(_UTC)
+            checkpoint_id = self._generate_checkpoint_id(now)
+
+            expires_at = None
+            if expiry_minutes is not None:
+                expires_at = now + _minutes_delta(expiry_minutes)
+            elif self.DEFAULT_EXPIRY_MINUTES:
+                expires_at = now + _minutes_delta(self.DEFAULT_EXPIRY_MINUTES)
+
+            checkpoint = Checkpoint(
+                id=checkpoint_id,
+                scope=_intern_scope(scope),
+                reason=_intern(reason),
+                created_at=now,
+                expires_at=expires_at,
+                metadata=metadata or {},
             )
 
-        checkpoint = Checkpoint(
-            id=checkpoint_id,
-            scope=scope,
-            reason=reason,
-            created_at=datetime.now(timezone.utc),
-            expires_at=expires_at,
-            metadata=metadata or {},
-        )
-
-        with self._lock:
             # Move previous active checkpoint to history
             if self._active_checkpoint:
-                self._checkpoint_history.append(self._active_checkpoint)
+                self._append_history(self._active_checkpoint)
                 self._prune_history_if_needed()
 
             self._active_checkpoint = checkpoint
-            self._write_marker(checkpoint)
+            self._by_id[checkpoint_id] = checkpoint
+            self._sync_marker()
             self._persist_state()
         return checkpoint_id
 
-    def _generate_checkpoint_id(self) -> str:
+    def _generate_checkpoint_id(self, now: datetime | None = None) -> str:
         """Generate a unique checkpoint ID with 128 bits of entropy.
 
         Uses 16 cryptographically random bytes (128 bits) encoded as
         32 hex characters.  ``os.urandom`` is already cryptographically
         secure, so hashing adds no additional entropy.
         """
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now(_UTC)).strftime("%Y%m%d_%H%M%S")
         random_suffix = os.urandom(16).hex()
         return f"chk_{timestamp}_{random_suffix}"
 
@@ -381,8 +732,17 @@ class CheckpointTracker:
         if len(self._checkpoint_history) > self._max_history:
             to_prune = self._checkpoint_history[: -self._max_history]
             self._archive_checkpoints(to_prune)
+            self._unindex(to_prune)
             self._checkpoint_history = self._checkpoint_history[-self._max_history :]
 
+    def _unindex(self, checkpoints: Iterable[Checkpoint]) -> None:
+        """Drop checkpoints that left history from the ID index."""
+        by_id = self._by_id
+        for cp in checkpoints:
+            # Identity check: a duplicate ID may belong to a newer entry.
+            if by_id.get(cp.id) is cp:
+                del by_id[cp.id]
+
     def _archive_checkpoints(self, checkpoints: list[Checkpoint]) -> None:
         """SEC-011: Write pruned checkpoints to archive JSONL file.
 
@@ -445,38 +805,70 @@ class CheckpointTracker:
             logger.warning("Failed to read checkpoint archive: %s", e)
             return []
 
-    def _write_marker(self, checkpoint: Checkpoint) -> None:
+    def _sync_marker(self) -> None:
+        """Make the shell hook marker file reflect the active checkpoint.
+
+        The marker is derived state: it exists, describing the active
+        checkpoint, exactly when one is active.  The last synced state is
+        remembered so repeated syncs skip the filesystem; the first sync
+        after startup, or after a failed write/remove, always acts.
+        """
+        if self._marker_path_str is None:
+            return
+        active = self._active_checkpoint
+        wanted = active.id if active is not None else None
+        if self._marker_synced and wanted == self._marker_id:
+            return
+        if active is not None:
+            self._marker_synced = self._write_marker(active)
+        else:
+            self._marker_synced = self._remove_marker()
+        self._marker_id = wanted
+
+    def _write_marker(self, checkpoint: Checkpoint) -> bool:
         """Atomically write the shell hook marker file with checkpoint metadata.
 
         Uses write-to-tmp + rename so the shell PreToolUse hook never reads
         a partially written marker file.
+
+        Returns:
+            True if the marker was written.
         """
-        if self._marker_dir is None:
-            return
+        marker_dir = self._marker_dir_str
+        marker_path = self._marker_path_str
+        tmp_path = self._marker_tmp_str
+        if marker_dir is None or marker_path is None or tmp_path is None:
+            return False
         try:
-            marker_path = self._marker_dir / "checkpoint.ok"
-            self._marker_dir.mkdir(parents=True, exist_ok=True)
-            created_ts = int(checkpoint.created_at.timestamp())
+            if not self._marker_dir_ready:
+                os.makedirs(marker_dir, exist_ok=True)
+                self._marker_dir_ready = True
+            _, _, created_epoch, expires_epoch = checkpoint._epoch()
+            created_ts = int(created_epoch)
             expires_ts = (
-                int(checkpoint.expires_at.timestamp())
-                if checkpoint.expires_at
-                else created_ts + self.DEFAULT_EXPIRY_MINUTES * 60
+                int(expires_epoch)
+                if expires_epoch is not None
+                else created_ts + self._default_expiry_seconds
             )
-            marker_data = {
-                "checkpoint_id": checkpoint.id,
-                "created_at": created_ts,
-                "expires_at": expires_ts,
-            }
-            fd, tmp_path = tempfile.mkstemp(dir=str(self._marker_dir), suffix=".tmp")
+            # Fixed-shape payload: checkpoint IDs are generated internally
+            # (``chk_`` + timestamp + hex), so no JSON escaping is needed.
+            payload = (
+                f'{{"checkpoint_id":"{checkpoint.id}",'
+                f'"created_at":{created_ts},"expires_at":{expires_ts}}}'
+            ).encode("ascii")
+            try:
+                fd = _create_tmp(tmp_path)
+            except FileNotFoundError:
+                # Directory removed externally since it was created; recreate
+                # it once rather than stat-ing it on every write.
+                os.makedirs(marker_dir, exist_ok=True)
+                fd = _create_tmp(tmp_path)
             try:
                 try:
-                    f = os.fdopen(fd, "w", encoding="utf-8")
-                except Exception:
+                    os.write(fd, payload)
+                finally:
                     os.close(fd)
-                    raise
-                with f:
-                    json.dump(marker_data, f)
-                os.replace(tmp_path, str(marker_path))
+                os.replace(tmp_path, marker_path)
             except Exception:
                 try:
                     os.unlink(tmp_path)
@@ -485,23 +877,62 @@ class CheckpointTracker:
                 raise
         except OSError as e:
             logger.warning("Failed to write checkpoint marker: %s", e)
+            return False
+        return True
 
-    def _remove_marker(self) -> None:
-        """Remove the shell hook marker file when checkpoint is consumed/invalidated."""
-        if self._marker_dir is None:
-            return
+    def _remove_marker(self) -> bool:
+        """Remove the shell hook marker file when checkpoint is consumed/invalidated.
+
+        Returns:
+            True if the marker is now absent.
+        """
+        if self._marker_path_str is None:
+            return False
         try:
-            marker_path = self._marker_dir / "checkpoint.ok"
-            marker_path.unlink(missing_ok=True)
+            os.unlink(self._marker_path_str)
+        except FileNotFoundError:
+            pass
         except OSError as e:
             logger.warning("Failed to remove checkpoint marker: %s", e)
+            return False
+        return True
+
+    def _valid_active(self) -> Checkpoint | None:
+        """Return the active checkpoint if valid.  Caller must hold the lock.
+
+        Mutations are gated by bursts of validity checks microseconds apart,
+        while expiry granularity is minutes.  A positive result is therefore
+        reused for up to ``_VALIDITY_CACHE_SECONDS`` of monotonic time, never
+        past the checkpoint's own expiry.  Consumption is re-checked on every
+        call, and replacing the active checkpoint or reassigning its
+        ``expires_at`` misses the cache by identity.
+        """
+        cp = self._active_checkpoint
+        if cp is None or cp.consumed:
+            return None
+        mono_now = time.monotonic()
+        if (
+            cp is self._valid_cache_cp
+            and cp.expires_at is self._valid_cache_expires
+            and mono_now < self._valid_cache_until
+        ):
+            return cp
+        window = self._VALIDITY_CACHE_SECONDS
+        if cp.expires_at is not None:
+            remaining = cp._epoch()[3] - time.time()
+            if remaining < 0:
+                self._valid_cache_cp = None
+                return None
+            window = min(window, remaining)
+        self._valid_cache_cp = cp
+        self._valid_cache_expires = cp.expires_at
+        self._valid_cache_until = mono_now + window
+        return cp
 
     def has_valid_checkpoint(self) -> bool:
         """Check if there's a valid (unexpired, unconsumed) checkpoint."""
         with self._lock:
-            if self._active_checkpoint is None:
-                return False
-            return self._active_checkpoint.is_valid()
+            return self._valid_active() is not None
 
     def validate_and_reserve(self) -> tuple[bool, str | None]:
         """Atomically check and reserve the active checkpoint.
@@ -516,11 +947,10 @@ class CheckpointTracker:
             is called.
         """
         with self._lock:
-            if self._active_checkpoint is None:
-                return False, None
-            if not self._active_checkpoint.is_valid():
+            cp = self._valid_active()
+            if cp is None:
                 return False, None
-            return True, self._active_checkpoint.id
+            return True, cp.id
 
     def has_checkpoint_for_scope(self, target: str) -> bool:
         """
@@ -533,18 +963,13 @@ class CheckpointTracker:
             True if a valid checkpoint covers this target
         """
         with self._lock:
-            if self._active_checkpoint is None:
-                return False
-            if not self._active_checkpoint.is_valid():
-                return False
-            return self._active_checkpoint.matches_scope(target)
+            cp = self._valid_active()
+            return cp is not None and cp.matches_scope(target)
 
     def get_active_checkpoint(self) -> Checkpoint | None:
         """Get the currently active checkpoint, if any."""
         with self._lock:
-            if self._active_checkpoint and self._active_checkpoint.is_valid():
-                return self._active_checkpoint
-            return None
+            return self._valid_active()
 
     def get_active_checkpoint_id(self) -> str | None:
         """Get the ID of the active checkpoint, or None."""
@@ -572,12 +997,15 @@ class CheckpointTracker:
             self._active_checkpoint = None
 
             consumed.consumed = True
-            consumed.consumed_at = datetime.now(timezone.utc)
+            consumed.consumed_at = datetime.now(_UTC)
             checkpoint_id = consumed.id
 
             # Move to history
-            self._checkpoint_history.append(consumed)
-            self._remove_marker()
+            if self._retain_consumed:
+                self._append_history(consumed)
+            else:
+                self._unindex((consumed,))
+            self._sync_marker()
             self._persist_state()
 
             return checkpoint_id
@@ -595,14 +1023,7 @@ class CheckpointTracker:
             Checkpoint or None if not found
         """
         with self._lock:
-            if self._active_checkpoint and self._active_checkpoint.id == checkpoint_id:
-                return self._active_checkpoint
-
-            for checkpoint in self._checkpoint_history:
-                if checkpoint.id == checkpoint_id:
-                    return checkpoint
-
-            return None
+            return self._by_id.get(checkpoint_id)
 
     def get_history(self, limit: int = 10) -> list[Checkpoint]:
         """
@@ -615,10 +1036,42 @@ class CheckpointTracker:
             List of checkpoints, most recent first
         """
         with self._lock:
-            history = list(self._checkpoint_history)
-            if self._active_checkpoint:
-                history.append(self._active_checkpoint)
-            return sorted(history, key=lambda c: c.created_at, reverse=True)[:limit]
+            if limit <= 0:
+                return []
+            history = self._checkpoint_history
+            active_cp = self._active_checkpoint
+            if self._history_ordered and (
+                active_cp is None
+                or not history
+                or active_cp.created_at >= history[-1].created_at
+            ):
+                # Sorted fast path: the newest entries are the tail.  Widen
+                # the tail to every entry tied with its oldest one, then sort
+                # it stably (linear on ascending input) so ties keep the
+                # same order as a full sort.
+                n = len(history)
+                start = max(0, n + (active_cp is not None) - limit)
+                if start > 0:
+                    boundary = (
+                        history[start].created_at
+                        if start < n or active_cp is None
+                        else active_cp.created_at
+                    )
+                    while start > 0 and history[start - 1].created_at == boundary:
+                        start -= 1
+                recent = history[start:]
+                if active_cp is not None:
+                    recent.append(active_cp)
+                recent.sort(key=lambda c: c.created_at, reverse=True)
+                del recent[limit:]
+                return recent
+            active = (active_cp,) if active_cp else ()
+            # Partial sort: O(n log limit) with no intermediate list copy.
+            return heapq.nlargest(
+                limit,
+                itertools.chain(self._checkpoint_history, active),
+                key=lambda c: c.created_at,
+            )
 
     def clear_expired(self) -> int:
         """
@@ -632,47 +1085,46 @@ class CheckpointTracker:
             Number of expired checkpoints removed (active + history)
         """
         with self._lock:
-            now = datetime.now(timezone.utc)
-            active_cleared = False
+            now = time.time()
+            cleared = 0
 
-            # Move expired active checkpoint to history FIRST so it gets
-            # filtered along with all other expired history entries.
             # Use explicit expiry check — not is_valid(), which also returns
             # False for consumed checkpoints (different semantic).
-            if (
-                self._active_checkpoint
-                and self._active_checkpoint.expires_at
-                and now > self._active_checkpoint.expires_at
-            ):
-                self._checkpoint_history.append(self._active_checkpoint)
+            active = self._active_checkpoint
+            if active and active.expires_at and now > active._epoch()[3]:
                 self._active_checkpoint = None
-                self._remove_marker()
-                active_cleared = True
-
-            original_count = len(self._checkpoint_history)
-            self._checkpoint_history = [
-                c
-                for c in self._checkpoint_history
-                if c.expires_at is None or c.expires_at > now
+                self._unindex((active,))
+                self._sync_marker()
+                cleared = 1
+
+            # History is capped at max_history, so a scan with cached epochs
+            # is cheap and always sees the current expires_at.
+            history = self._checkpoint_history
+            expired = [
+                c for c in history if c.expires_at is not None and now >= c._epoch()[3]
             ]
-            # Includes the expired active (appended above) that was then filtered out.
-            total_cleared = original_count - len(self._checkpoint_history)
+            if expired:
+                self._unindex(expired)
+                gone = {id(c) for c in expired}
+                self._checkpoint_history = [c for c in history if id(c) not in gone]
+                cleared += len(expired)
 
             # Persist whenever state changed (active cleared or history pruned)
-            if active_cleared or total_cleared > 0:
+            if cleared:
                 self._persist_state()
-            return total_cleared
+            return cleared
 
     def invalidate_all(self) -> None:
         """Invalidate all checkpoints (used for rollback scenarios)."""
         with self._lock:
             if self._active_checkpoint:
                 self._active_checkpoint.consumed = True
-                self._active_checkpoint.consumed_at = datetime.now(timezone.utc)
-                self._checkpoint_history.append(self._active_checkpoint)
+                self._active_checkpoint.consumed_at = datetime.now(_UTC)
+                self._append_history(self._active_checkpoint)
                 self._active_checkpoint = None
-                self._remove_marker()
-                self._persist_state()
+                self._sync_marker()
+                # Rollback path: never defer this write.
+                self._persist_state_now()
 
     @property
     def checkpoint_count(self) -> int:
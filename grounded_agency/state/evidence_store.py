@@ -7,16 +7,19 @@ Evidence anchors form the provenance chain for grounded decisions.
 
 from __future__ import annotations
 
-import json
+import bisect
 import logging
-import re
+import sys
 import threading
+import time
 from collections import defaultdict, deque
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from itertools import islice
-from typing import Any
+from itertools import islice, repeat
+from typing import Any, BinaryIO
+
+from ..utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +27,6 @@ logger = logging.getLogger(__name__)
 _MAX_METADATA_SIZE_BYTES = 1024  # 1KB max per anchor
 _MAX_METADATA_DEPTH = 2  # No deeply nested structures
 _MAX_KEY_LENGTH = 64  # SEC-008: Maximum metadata key length
-_VALID_KEY_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
 
 # SEC-008: Explicit denylist for dangerous metadata keys.
 # These keys can cause prototype pollution or class manipulation
@@ -53,48 +55,128 @@ _DENIED_KEYS: frozenset[str] = frozenset(
 def _validate_metadata_key(key: str) -> bool:
     """Check if metadata key is safe.
 
-    SEC-008: Validates against regex pattern, explicit denylist,
-    max length, and rejects keys starting with double underscore.
+    SEC-008: Keys must match ``[a-zA-Z_][a-zA-Z0-9_]*`` (an ASCII
+    identifier), stay within the max length, avoid the explicit denylist,
+    and not start with a double underscore (broader than the denylist).
     """
-    if len(key) > _MAX_KEY_LENGTH:
-        return False
-    # Reject all dunder keys (broader than explicit denylist)
-    if key.startswith("__"):
-        return False
-    if key in _DENIED_KEYS:
-        return False
-    return bool(_VALID_KEY_PATTERN.match(key))
+    return (
+        len(key) <= _MAX_KEY_LENGTH
+        and not key.startswith("__")
+        and key not in _DENIED_KEYS
+        and key.isascii()
+        and key.isidentifier()
+    )
+
+
+_SCALAR_TYPES: frozenset[type] = frozenset({str, int, float, bool, type(None)})
 
 
 def _validate_metadata_depth(value: Any, current_depth: int = 0) -> bool:
-    """Check if metadata value doesn't exceed max depth."""
+    """Check if metadata value doesn't exceed max depth.
+
+    Walks nested dicts/lists with an explicit stack and stops at the
+    first container whose children would sit below the depth limit.
+    """
     if current_depth > _MAX_METADATA_DEPTH:
         return False
-    if isinstance(value, dict):
-        return all(
-            _validate_metadata_depth(v, current_depth + 1) for v in value.values()
-        )
-    if isinstance(value, list):
-        return all(_validate_metadata_depth(v, current_depth + 1) for v in value)
+    if type(value) in _SCALAR_TYPES:
+        return True
+    stack = [(value, current_depth)]
+    while stack:
+        node, depth = stack.pop()
+        # Exact-type checks first; isinstance() still catches subclasses
+        # such as OrderedDict so they cannot bypass the limit.
+        node_type = type(node)
+        if node_type is dict:
+            children: Iterable[Any] = node.values()
+        elif node_type is list:
+            children = node
+        elif node_type in _SCALAR_TYPES:
+            continue
+        elif isinstance(node, dict):
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        if not children:
+            continue
+        if depth >= _MAX_METADATA_DEPTH:
+            return False
+        stack.extend(zip(children, repeat(depth + 1)))
     return True
 
 
+# Longest compact JSON form of a float or 64-bit int, e.g. -1.2345678901234567e-308.
+_SCALAR_JSON_BOUND = 24
+
+
+def _json_size_bound(value: Any, budget: int) -> int:
+    """Upper bound on the compact UTF-8 JSON size of *value*.
+
+    Only JSON-native types are sized; anything else (or a structure that
+    grows past *budget*) returns a value above *budget* so the caller
+    falls back to real serialization.
+    """
+    t = type(value)
+    if t is str:
+        text: str = value
+        if text.isascii() and text.isprintable():
+            # Only '"' and '\\' need escaping, each to two bytes.
+            return len(text) + text.count('"') + text.count("\\") + 2
+        # \uXXXX escapes and 4-byte UTF-8 sequences both fit in six bytes.
+        return 6 * len(text) + 2
+    if value is None or t is bool or t is float:
+        return _SCALAR_JSON_BOUND
+    if t is int:
+        if -(1 << 63) <= value < (1 << 64):
+            return _SCALAR_JSON_BOUND
+        return budget + 1
+    if t is dict:
+        total = 2
+        for k, v in value.items():
+            if type(k) is not str:
+                return budget + 1
+            total += _json_size_bound(k, budget) + _json_size_bound(v, budget) + 2
+            if total > budget:
+                return total
+        return total
+    if t is list or t is tuple:
+        total = 2
+        for v in value:
+            total += _json_size_bound(v, budget) + 1
+            if total > budget:
+                return total
+        return total
+    return budget + 1
+
+
+_TRUNCATED = "[truncated]"
+_TRUNCATED_SIZE = len(_TRUNCATED) + 2  # JSON-quoted
+
+
 def _sanitize_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
     """
     Sanitize metadata to prevent injection attacks.
 
     - Validates key names (alphanumeric + underscore)
     - Limits nesting depth
-    - Enforces size limit by truncating values
+    - Enforces size limit by truncating the largest values (dropping
+      entries only if truncation alone cannot fit); size is measured as
+      compact UTF-8 JSON, the form the JSON codec writes
     """
     if not metadata:
         return {}
 
     sanitized: dict[str, Any] = {}
+    # Running upper bound on the serialized size: "{}" plus, per entry,
+    # the quoted key, ':' and ',' (valid keys never need escaping).
+    size_bound = 2
 
-    for key, value in metadata.items():
+    for raw_key, value in metadata.items():
+        key = raw_key if type(raw_key) is str else str(raw_key)
         # Skip invalid keys
-        if not _validate_metadata_key(str(key)):
+        if not _validate_metadata_key(key):
             continue
 
         # Skip values that are too deeply nested
@@ -102,32 +184,78 @@ def _sanitize_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
             # Flatten to string representation
             value = str(value)[:100]
 
-        sanitized[str(key)] = value
+        # Keys come from a small vocabulary; share one string per key
+        key = sys.intern(key)
+        sanitized[key] = value
+        if size_bound <= _MAX_METADATA_SIZE_BYTES:
+            size_bound += (
+                len(key) + 4 + _json_size_bound(value, _MAX_METADATA_SIZE_BYTES)
+            )
+
+    # Small, JSON-native metadata cannot exceed the limit; skip encoding it.
+    if size_bound <= _MAX_METADATA_SIZE_BYTES:
+        return sanitized
 
-    # Check size and truncate if needed
+    # Measure each value once (compact UTF-8 JSON) and truncate if needed
     try:
-        serialized = json.dumps(sanitized, default=str)
-        if len(serialized.encode("utf-8")) > _MAX_METADATA_SIZE_BYTES:
-            # Truncate by removing largest values until under limit
-            while (
-                len(json.dumps(sanitized, default=str).encode("utf-8"))
-                > _MAX_METADATA_SIZE_BYTES
-            ):
-                if not sanitized:
-                    break
-                # Remove the key with largest value
-                largest_key = max(
-                    sanitized.keys(), key=lambda k: len(str(sanitized[k]))
-                )
-                sanitized[largest_key] = "[truncated]"
+        sizes = {
+            key: len(json_codec.dumps(value, default=str))
+            for key, value in sanitized.items()
+        }
     except (TypeError, ValueError) as e:
         # If serialization fails, return minimal safe metadata
         logger.debug("Metadata serialization failed: %s", e)
         return {"_error": "metadata_serialization_failed"}
 
+    # "{}" + per entry '"key":value' + separating commas
+    total = 1 + sum(len(key) + 4 + size for key, size in sizes.items())
+    if total <= _MAX_METADATA_SIZE_BYTES:
+        return sanitized
+
+    # Replace the largest values first, keeping a running total instead of
+    # re-serializing after every change.
+    by_size = sorted(sizes, key=sizes.__getitem__, reverse=True)
+    for key in by_size:
+        if total <= _MAX_METADATA_SIZE_BYTES or sizes[key] <= _TRUNCATED_SIZE:
+            break
+        sanitized[key] = _TRUNCATED
+        total -= sizes[key] - _TRUNCATED_SIZE
+        sizes[key] = _TRUNCATED_SIZE
+
+    # Too many keys to fit even with every value truncated: drop entries.
+    for key in by_size:
+        if total <= _MAX_METADATA_SIZE_BYTES:
+            break
+        del sanitized[key]
+        total -= len(key) + 4 + sizes[key]
+
     return sanitized
 
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recent _now_iso() call.
+# Replaced as a whole tuple, so concurrent readers never see a torn pair.
+_iso_second_cache: tuple[int, str] = (-1, "")
+_COMPACT_TIMESTAMP = str.maketrans("", "", "-T:")
+
+
+def _now_iso() -> str:
+    """Current UTC time, formatted like ``datetime.now(timezone.utc).isoformat()``.
+
+    The date/time prefix is only re-rendered when the wall-clock second
+    changes, so most calls avoid building a datetime at all.
+    """
+    global _iso_second_cache
+    sec, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _iso_second_cache
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _iso_second_cache = (sec, prefix)
+    micros = nanos // 1000
+    if micros:
+        return f"{prefix}.{micros:06d}+00:00"
+    return f"{prefix}+00:00"
+
+
 # Priority levels for evidence retention during eviction (SEC-004).
 # Higher values = more important = evicted last.
 PRIORITY_LOW = 0
@@ -144,7 +272,20 @@ _KIND_PRIORITY: dict[str, int] = {
 }
 
 
-@dataclass(slots=True)
+# Metadata keys written by the EvidenceAnchor factories; by default
+# EvidenceStore keeps an equality index on these so search_by_metadata()
+# avoids a full scan.
+_INDEXED_META_KEYS: tuple[str, ...] = (
+    "tool_name",
+    "path",
+    "operation",
+    "exit_code",
+    "target",
+    "checkpoint_id",
+)
+
+
+@dataclass(slots=True, eq=False)
 class EvidenceAnchor:
     """
     A single piece of evidence from tool execution.
@@ -153,6 +294,15 @@ class EvidenceAnchor:
     enabling verification that decisions are grounded in
     actual observations rather than hallucination.
 
+    Each anchor is a distinct observation, so equality and hashing are
+    by identity; two captures with identical fields remain separate
+    evidence.
+
+    Treat an anchor as read-only once it is added to an EvidenceStore: the
+    store indexes ``ref`` and indexed ``metadata`` values as they are at
+    insert time, so later edits are not seen by search_by_ref_prefix() or
+    search_by_metadata().
+
     Attributes:
         ref: Reference string (e.g., "tool:Read:abc123", "file:src/main.py")
         kind: Type of evidence ("tool_output", "file", "command", "mutation")
@@ -169,7 +319,12 @@ class EvidenceAnchor:
 
     def __post_init__(self) -> None:
         """Validate and sanitize metadata after initialization."""
-        self.metadata = _sanitize_metadata(self.metadata)
+        metadata = self.metadata
+        self.metadata = _sanitize_metadata(metadata) if metadata else {}
+        # Only a handful of kinds exist; share one string per kind so the
+        # _by_kind index lookups can short-circuit on identity.
+        if type(self.kind) is str:
+            self.kind = sys.intern(self.kind)
         # SEC-004: Auto-set priority from kind if still at default
         if self.priority == PRIORITY_NORMAL:
             self.priority = _KIND_PRIORITY.get(self.kind, PRIORITY_NORMAL)
@@ -197,7 +352,7 @@ class EvidenceAnchor:
         return cls(
             ref=f"tool:{tool_name}:{tool_use_id}",
             kind="tool_output",
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=_now_iso(),
             metadata={
                 "tool_name": tool_name,
                 "tool_input": tool_input,
@@ -226,7 +381,7 @@ class EvidenceAnchor:
         return cls(
             ref=f"file:{file_path}",
             kind="file",
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=_now_iso(),
             metadata={
                 "path": file_path,
                 "hash": file_hash,
@@ -252,11 +407,12 @@ class EvidenceAnchor:
         Returns:
             EvidenceAnchor for this command execution
         """
-        ref_id = tool_use_id or datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        timestamp = _now_iso()
+        ref_id = tool_use_id or timestamp[:19].translate(_COMPACT_TIMESTAMP)
         return cls(
             ref=f"command:{ref_id}",
             kind="command",
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=timestamp,
             metadata={
                 "command": command,
                 "exit_code": exit_code,
@@ -284,7 +440,7 @@ class EvidenceAnchor:
         return cls(
             ref=f"mutation:{target}",
             kind="mutation",
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=_now_iso(),
             metadata={
                 "target": target,
                 "operation": operation,
@@ -301,6 +457,15 @@ class EvidenceAnchor:
             "timestamp": self.timestamp,
         }
 
+    def _export_dict(self) -> dict[str, Any]:
+        """``to_dict()`` plus metadata, built in one dict for store exports."""
+        return {
+            "ref": self.ref,
+            "kind": self.kind,
+            "timestamp": self.timestamp,
+            "metadata": self.metadata,
+        }
+
     def mark_critical(self) -> None:
         """Mark this anchor as critical for forensic retention.
 
@@ -313,6 +478,45 @@ class EvidenceAnchor:
         return self.ref
 
 
+def _meta_index_keys(
+    metadata: dict[str, Any], indexed_keys: Iterable[str]
+) -> Iterator[tuple[str, Any]]:
+    """Yield the hashable ``(key, value)`` pairs EvidenceStore indexes."""
+    for key in indexed_keys:
+        value = metadata.get(key)
+        if value is None:
+            continue
+        try:
+            hash(value)
+        except TypeError:
+            continue
+        yield key, value
+
+
+def _index_add(
+    index: dict[Any, dict[int, EvidenceAnchor]],
+    key: Any,
+    seq_id: int,
+    anchor: EvidenceAnchor,
+) -> None:
+    """Add *anchor* under *key* in a seq_id-keyed secondary index."""
+    bucket = index.get(key)
+    if bucket is None:
+        bucket = index[key] = {}
+    bucket[seq_id] = anchor
+
+
+def _index_discard(
+    index: dict[Any, dict[int, EvidenceAnchor]], key: Any, seq_id: int
+) -> None:
+    """Remove *seq_id* under *key*, dropping the bucket once it is empty."""
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(seq_id, None)
+        if not bucket:
+            del index[key]
+
+
 class EvidenceStore:
     """
     In-memory store for evidence anchors with bounded size.
@@ -340,25 +544,34 @@ class EvidenceStore:
 
     DEFAULT_MAX_ANCHORS: int = 10000
 
-    def __init__(self, max_anchors: int | None = None) -> None:
+    def __init__(
+        self,
+        max_anchors: int | None = None,
+        indexed_metadata_keys: Iterable[str] = _INDEXED_META_KEYS,
+    ) -> None:
         """
         Initialize the evidence store.
 
         Args:
             max_anchors: Maximum number of anchors to store (default: 10000).
                         When exceeded, lowest-priority oldest anchors are evicted.
+            indexed_metadata_keys: Metadata keys that search_by_metadata()
+                        answers from an index instead of a full scan.
         """
         self._max_anchors = (
             max_anchors if max_anchors is not None else self.DEFAULT_MAX_ANCHORS
         )
+        self._indexed_meta_keys: tuple[str, ...] = tuple(
+            dict.fromkeys(indexed_metadata_keys)
+        )
         self._lock = threading.Lock()
-        # Primary ordered store — deque for O(1) append/popleft
-        self._anchors: deque[EvidenceAnchor] = deque()
 
         # Sequence counter for O(1) eviction bookkeeping
         self._seq_counter: int = 0
 
-        # Bidirectional mappings: anchor identity <-> seq_id
+        # Bidirectional mappings: anchor identity <-> seq_id.  seq_ids are
+        # assigned in increasing order, so _seq_to_anchor doubles as the
+        # primary insertion-ordered store with O(1) deletion from anywhere.
         self._anchor_to_seq: dict[int, int] = {}  # id(anchor) -> seq_id
         self._seq_to_anchor: dict[int, EvidenceAnchor] = {}  # seq_id -> anchor
 
@@ -367,8 +580,21 @@ class EvidenceStore:
         self._seq_to_priority: dict[int, int] = {}  # seq_id -> priority (reverse)
 
         # Secondary indexes keyed by seq_id for O(1) removal
-        self._by_kind: dict[str, dict[int, EvidenceAnchor]] = defaultdict(dict)
-        self._by_capability: dict[str, dict[int, EvidenceAnchor]] = defaultdict(dict)
+        # (plain dicts: entries are created on insert and dropped when empty)
+        self._by_kind: dict[str, dict[int, EvidenceAnchor]] = {}
+        self._by_capability: dict[str, dict[int, EvidenceAnchor]] = {}
+        self._seq_to_capability: dict[int, str] = {}  # seq_id -> capability_id
+
+        # (ref, seq_id) pairs kept sorted for O(log n + k) prefix search,
+        # plus the ref each seq_id was indexed under (removal must not depend
+        # on the anchor's current ref)
+        self._sorted_refs: list[tuple[str, int]] = []
+        self._seq_to_ref: dict[int, str] = {}
+
+        # (metadata key, value) -> anchors, for _indexed_meta_keys only, and
+        # the pairs each seq_id was indexed under (for removal)
+        self._by_meta: dict[tuple[str, Any], dict[int, EvidenceAnchor]] = {}
+        self._seq_to_meta: dict[int, tuple[tuple[str, Any], ...]] = {}
 
     def add_anchor(
         self,
@@ -386,30 +612,71 @@ class EvidenceStore:
             capability_id: Optional capability ID to associate with
         """
         with self._lock:
-            # Check if we need to evict before adding
-            if len(self._anchors) >= self._max_anchors:
-                self._evict_lowest_priority()
+            self._add_locked(anchor, capability_id)
 
-            # Assign next seq_id
-            seq_id = self._seq_counter
-            self._seq_counter += 1
-
-            # Add to primary store
-            self._anchors.append(anchor)
+    def add_anchors(
+        self,
+        anchors: Iterable[EvidenceAnchor],
+        capability_id: str | None = None,
+    ) -> None:
+        """
+        Add several evidence anchors under a single lock acquisition.
 
-            # Bidirectional identity mappings
-            self._anchor_to_seq[id(anchor)] = seq_id
-            self._seq_to_anchor[seq_id] = anchor
+        Equivalent to calling ``add_anchor`` for each anchor in order,
+        including SEC-004 eviction between inserts, so a batch larger than
+        the free capacity still evicts by priority across old and new
+        anchors alike.
 
-            # Priority bucket (insertion-ordered deque per priority level)
-            self._priority_buckets[anchor.priority].append(seq_id)
-            self._seq_to_priority[seq_id] = anchor.priority
+        Args:
+            anchors: Evidence anchors to add, oldest first
+            capability_id: Optional capability ID to associate with all of them
+        """
+        # Materialize first so anchor construction never runs under the lock
+        batch = list(anchors)
+        with self._lock:
+            for anchor in batch:
+                self._add_locked(anchor, capability_id)
 
-            # Secondary indexes (dict-keyed by seq_id for O(1) delete)
-            self._by_kind[anchor.kind][seq_id] = anchor
+    def _add_locked(self, anchor: EvidenceAnchor, capability_id: str | None) -> None:
+        """Insert *anchor* into the store and every index.
 
-            if capability_id:
-                self._by_capability[capability_id][seq_id] = anchor
+        Must be called with ``self._lock`` held.
+        """
+        seq_to_anchor = self._seq_to_anchor
+        # Check if we need to evict before adding
+        if len(seq_to_anchor) >= self._max_anchors:
+            self._evict_lowest_priority()
+
+        # Assign next seq_id
+        seq_id = self._seq_counter
+        self._seq_counter = seq_id + 1
+
+        # Bidirectional identity mappings (and primary store)
+        self._anchor_to_seq[id(anchor)] = seq_id
+        seq_to_anchor[seq_id] = anchor
+
+        # Priority bucket (insertion-ordered deque per priority level)
+        priority = anchor.priority
+        self._priority_buckets[priority].append(seq_id)
+        self._seq_to_priority[seq_id] = priority
+
+        # Secondary indexes (dict-keyed by seq_id for O(1) delete)
+        _index_add(self._by_kind, anchor.kind, seq_id, anchor)
+        ref = anchor.ref
+        bisect.insort(self._sorted_refs, (ref, seq_id))
+        self._seq_to_ref[seq_id] = ref
+        metadata = anchor.metadata
+        if metadata:
+            meta_keys = tuple(_meta_index_keys(metadata, self._indexed_meta_keys))
+            if meta_keys:
+                by_meta = self._by_meta
+                for meta_key in meta_keys:
+                    _index_add(by_meta, meta_key, seq_id, anchor)
+                self._seq_to_meta[seq_id] = meta_keys
+
+        if capability_id:
+            _index_add(self._by_capability, capability_id, seq_id, anchor)
+            self._seq_to_capability[seq_id] = capability_id
 
     def _evict_lowest_priority(self) -> None:
         """SEC-004: Evict the lowest-priority, oldest anchor from the store.
@@ -417,10 +684,10 @@ class EvidenceStore:
         Must be called with ``self._lock`` held.
 
         O(1) amortized: finds the lowest non-empty priority bucket, pops
-        the leftmost (oldest) seq_id, then removes from all indexes via
-        dict deletes.
+        the leftmost (oldest) seq_id, then removes it from the primary
+        store and all indexes via dict deletes.
         """
-        if not self._anchors:
+        if not self._seq_to_anchor:
             return
 
         # Find lowest non-empty priority bucket (iterate from LOW upward)
@@ -441,22 +708,9 @@ class EvidenceStore:
 
         victim = self._seq_to_anchor[victim_seq]
 
-        # Remove from seq bookkeeping
+        # Remove from the primary store and seq bookkeeping
         self._remove_from_indexes(victim_seq, victim)
 
-        # Remove from primary deque
-        # Common case: victim is leftmost (oldest in its priority, and that
-        # priority is the lowest), so popleft is O(1).
-        if self._anchors[0] is victim:
-            self._anchors.popleft()
-        else:
-            # Rare case: victim is not at head (higher-priority items precede it).
-            # Linear scan is unavoidable for deque mid-removal but rare in practice.
-            for i, a in enumerate(self._anchors):
-                if a is victim:
-                    del self._anchors[i]
-                    break
-
     def _remove_from_indexes(self, seq_id: int, anchor: EvidenceAnchor) -> None:
         """Remove an anchor from all secondary indexes by seq_id (O(1) per index)."""
         # Remove from seq <-> anchor mappings
@@ -465,15 +719,24 @@ class EvidenceStore:
         self._seq_to_priority.pop(seq_id, None)
 
         # Remove from kind index
-        kind_dict = self._by_kind.get(anchor.kind)
-        if kind_dict is not None:
-            kind_dict.pop(seq_id, None)
+        _index_discard(self._by_kind, anchor.kind, seq_id)
+
+        # Remove from sorted ref index, under the ref it was inserted with
+        ref = self._seq_to_ref.pop(seq_id, None)
+        if ref is not None:
+            entry = (ref, seq_id)
+            i = bisect.bisect_left(self._sorted_refs, entry)
+            if i < len(self._sorted_refs) and self._sorted_refs[i] == entry:
+                del self._sorted_refs[i]
 
-        # Remove from capability indexes
-        for cap_dict in self._by_capability.values():
-            if seq_id in cap_dict:
-                del cap_dict[seq_id]
-                break  # Anchor can only be in one capability dict
+        # Remove from metadata index, under the pairs it was inserted with
+        for meta_key in self._seq_to_meta.pop(seq_id, ()):
+            _index_discard(self._by_meta, meta_key, seq_id)
+
+        # Remove from capability index (an anchor has at most one capability)
+        capability_id = self._seq_to_capability.pop(seq_id, None)
+        if capability_id is not None:
+            _index_discard(self._by_capability, capability_id, seq_id)
 
     def get_recent(self, n: int = 10) -> list[str]:
         """
@@ -485,9 +748,7 @@ class EvidenceStore:
         Returns:
             List of evidence reference strings
         """
-        with self._lock:
-            start_idx = max(0, len(self._anchors) - n)
-            return [anchor.ref for anchor in islice(self._anchors, start_idx, None)]
+        return [anchor.ref for anchor in self.get_recent_anchors(n)]
 
     def get_recent_anchors(self, n: int = 10) -> list[EvidenceAnchor]:
         """
@@ -499,9 +760,12 @@ class EvidenceStore:
         Returns:
             List of EvidenceAnchor objects
         """
+        if n <= 0:
+            return []
         with self._lock:
-            start_idx = max(0, len(self._anchors) - n)
-            return list(islice(self._anchors, start_idx, None))
+            newest = list(islice(reversed(self._seq_to_anchor.values()), n))
+        newest.reverse()
+        return newest
 
     def get_by_kind(self, kind: str) -> list[EvidenceAnchor]:
         """
@@ -514,7 +778,8 @@ class EvidenceStore:
             List of matching anchors
         """
         with self._lock:
-            return list(self._by_kind.get(kind, {}).values())
+            kind_dict = self._by_kind.get(kind)
+            return list(kind_dict.values()) if kind_dict else []
 
     def get_for_capability(self, capability_id: str) -> list[EvidenceAnchor]:
         """
@@ -527,7 +792,8 @@ class EvidenceStore:
             List of associated anchors
         """
         with self._lock:
-            return list(self._by_capability.get(capability_id, {}).values())
+            cap_dict = self._by_capability.get(capability_id)
+            return list(cap_dict.values()) if cap_dict else []
 
     def get_for_capability_output(self, capability_id: str) -> list[str]:
         """
@@ -559,10 +825,26 @@ class EvidenceStore:
             prefix: Reference prefix to match (e.g., "tool:Read", "file:")
 
         Returns:
-            List of matching anchors
+            List of matching anchors, in insertion order
         """
         with self._lock:
-            return [a for a in self._anchors if a.ref.startswith(prefix)]
+            if not prefix:
+                return list(self._seq_to_anchor.values())
+            # Refs sharing the prefix form one contiguous run in sort order.
+            sorted_refs = self._sorted_refs
+            start = bisect.bisect_left(sorted_refs, (prefix,))
+            seq_ids = []
+            for ref, seq_id in islice(sorted_refs, start, None):
+                if not ref.startswith(prefix):
+                    break
+                seq_ids.append(seq_id)
+            seq_ids.sort()
+            seq_to_anchor = self._seq_to_anchor
+            return [
+                anchor
+                for seq_id in seq_ids
+                if (anchor := seq_to_anchor.get(seq_id)) is not None
+            ]
 
     def search_by_metadata(
         self,
@@ -572,6 +854,9 @@ class EvidenceStore:
         """
         Search for evidence anchors by metadata key-value.
 
+        Indexed keys are matched against the metadata each anchor had when
+        it was added (see EvidenceAnchor).
+
         Args:
             key: Metadata key to match
             value: Value to match
@@ -580,12 +865,21 @@ class EvidenceStore:
             List of matching anchors
         """
         with self._lock:
-            return [a for a in self._anchors if a.metadata.get(key) == value]
+            # None also matches anchors that lack the key, so it needs a scan.
+            if key in self._indexed_meta_keys and value is not None:
+                try:
+                    matches = self._by_meta.get((key, value))
+                except TypeError:  # unhashable value; fall through to a scan
+                    pass
+                else:
+                    return list(matches.values()) if matches else []
+            return [
+                a for a in self._seq_to_anchor.values() if a.metadata.get(key) == value
+            ]
 
     def clear(self) -> None:
         """Clear all evidence from the store."""
         with self._lock:
-            self._anchors.clear()
             self._seq_counter = 0
             self._anchor_to_seq.clear()
             self._seq_to_anchor.clear()
@@ -593,14 +887,19 @@ class EvidenceStore:
             self._seq_to_priority.clear()
             self._by_kind.clear()
             self._by_capability.clear()
+            self._seq_to_capability.clear()
+            self._sorted_refs.clear()
+            self._seq_to_ref.clear()
+            self._by_meta.clear()
+            self._seq_to_meta.clear()
 
     def __len__(self) -> int:
         with self._lock:
-            return len(self._anchors)
+            return len(self._seq_to_anchor)
 
     def __iter__(self) -> Iterator[EvidenceAnchor]:
         with self._lock:
-            return iter(list(self._anchors))
+            return iter(list(self._seq_to_anchor.values()))
 
     def to_list(self) -> list[dict[str, Any]]:
         """
@@ -610,4 +909,55 @@ class EvidenceStore:
             List of anchor dictionaries
         """
         with self._lock:
-            return [{**a.to_dict(), "metadata": a.metadata} for a in self._anchors]
+            return [a._export_dict() for a in self._seq_to_anchor.values()]
+
+    def iter_dicts(self) -> Iterator[dict[str, Any]]:
+        """
+        Lazily yield each anchor as a dict, in the same form as ``to_list()``.
+
+        The set of anchors is snapshotted when this is called; dicts are
+        built one at a time as the iterator is consumed.
+
+        Returns:
+            Iterator of anchor dictionaries
+        """
+        with self._lock:
+            anchors = list(self._seq_to_anchor.values())
+        return (a._export_dict() for a in anchors)
+
+    def dump_json(self, fp: BinaryIO, chunk_size: int = 512) -> None:
+        """
+        Stream all evidence to a binary file as a JSON array.
+
+        Encodes ``chunk_size`` anchors at a time so exporting a large store
+        never materializes every dict or the whole document at once.
+
+        Args:
+            fp: Binary file-like object to write to
+            chunk_size: Number of anchors encoded per write
+        """
+        dicts = self.iter_dicts()
+        fp.write(b"[")
+        separator = b""
+        while batch := list(islice(dicts, max(chunk_size, 1))):
+            fp.write(separator)
+            # Strip the enclosing brackets of each encoded batch
+            fp.write(json_codec.dumps(batch, default=str)[1:-1])
+            separator = b","
+        fp.write(b"]")
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Export all evidence as UTF-8 JSON bytes.
+
+        Equivalent to encoding ``to_list()``, in one pass through the
+        fast JSON codec; non-serializable metadata values are stringified.
+
+        Returns:
+            JSON array of anchor objects
+        """
+        with self._lock:
+            return json_codec.dumps(
+                [a._export_dict() for a in self._seq_to_anchor.values()],
+                default=str,
+            )
@@ -13,19 +13,27 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Bucket state is kept in integer units of 1/60e9 token, so a limit of
+# ``rpm`` requests per minute refills exactly ``rpm`` units per nanosecond
+# and refill/consume never round.
+_UNITS_PER_TOKEN = 60_000_000_000
+
 
 @dataclass(slots=True)
 class _Bucket:
-    """Internal token bucket state."""
+    """Internal token bucket state (fixed-point, see _UNITS_PER_TOKEN)."""
 
-    tokens: float
-    last_refill: float
-    capacity: int
-    refill_rate: float  # tokens per second
+    tokens: int  # units
+    last_refill_ns: int  # time.monotonic_ns()
+    capacity: int  # units
+    refill_rate: int  # units per nanosecond (== requests per minute)
+    lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
 
 
 @dataclass(slots=True)
@@ -59,7 +67,8 @@ class RateLimitConfig:
 class RateLimiter:
     """Token bucket rate limiter with per-risk-level buckets.
 
-    Thread-safe: uses a lock to protect bucket state.
+    Thread-safe: each bucket has its own lock, so callers at different
+    risk levels never contend with each other.
 
     Example:
         limiter = RateLimiter(RateLimitConfig(high_rpm=10))
@@ -74,28 +83,28 @@ class RateLimiter:
 
     def __init__(self, config: RateLimitConfig | None = None) -> None:
         self._config = config or RateLimitConfig()
-        self._lock = threading.Lock()
-        self._buckets: dict[str, _Bucket] = {}
-        self._init_buckets()
+        self._buckets: dict[str, _Bucket] = self._init_buckets()
 
-    def _init_buckets(self) -> None:
-        """Initialize token buckets for each risk level."""
-        now = time.monotonic()
+    def _init_buckets(self) -> dict[str, _Bucket]:
+        """Build full token buckets for each risk level."""
+        now = time.monotonic_ns()
         cfg = self._config
         burst = cfg.burst_multiplier
 
+        buckets: dict[str, _Bucket] = {}
         for risk, rpm in [
             ("high", cfg.high_rpm),
             ("medium", cfg.medium_rpm),
             ("low", cfg.low_rpm),
         ]:
-            capacity = max(1, int(rpm * burst))
-            self._buckets[risk] = _Bucket(
-                tokens=float(capacity),
-                last_refill=now,
+            capacity = max(1, int(rpm * burst)) * _UNITS_PER_TOKEN
+            buckets[risk] = _Bucket(
+                tokens=capacity,
+                last_refill_ns=now,
                 capacity=capacity,
-                refill_rate=rpm / 60.0,  # tokens per second
+                refill_rate=rpm,
             )
+        return buckets
 
     def allow(self, risk_level: str) -> bool:
         """Check if a request at the given risk level is allowed.
@@ -108,49 +117,53 @@ class RateLimiter:
         Returns:
             True if the request is allowed, False if rate limited.
         """
-        with self._lock:
-            bucket = self._buckets.get(risk_level)
-            if bucket is None:
-                # Unknown risk level — allow but log
-                logger.warning("Unknown risk level for rate limiting: %s", risk_level)
-                return True
-
+        # The bucket map is never mutated, only replaced by reset(), so
+        # the lookup itself needs no lock.
+        bucket = self._buckets.get(risk_level)
+        if bucket is None:
+            # Unknown risk level — allow but log
+            logger.warning("Unknown risk level for rate limiting: %s", risk_level)
+            return True
+
+        with bucket.lock:
             self._refill(bucket)
 
-            if bucket.tokens >= 1.0:
-                bucket.tokens -= 1.0
+            if bucket.tokens >= _UNITS_PER_TOKEN:
+                bucket.tokens -= _UNITS_PER_TOKEN
                 return True
+            remaining = bucket.tokens / _UNITS_PER_TOKEN
 
-            logger.warning(
-                "Rate limited: %s-risk capability (%.1f tokens remaining)",
-                risk_level,
-                bucket.tokens,
-            )
-            return False
+        logger.warning(
+            "Rate limited: %s-risk capability (%.1f tokens remaining)",
+            risk_level,
+            remaining,
+        )
+        return False
 
     def _refill(self, bucket: _Bucket) -> None:
-        """Add tokens based on elapsed time since last refill."""
-        now = time.monotonic()
-        elapsed = now - bucket.last_refill
+        """Add tokens based on elapsed time since last refill.
+
+        Must be called with ``bucket.lock`` held.
+        """
+        now = time.monotonic_ns()
+        elapsed = now - bucket.last_refill_ns
         if elapsed <= 0:
             return
 
         bucket.tokens = min(
-            float(bucket.capacity),
-            bucket.tokens + elapsed * bucket.refill_rate,
+            bucket.capacity, bucket.tokens + elapsed * bucket.refill_rate
         )
-        bucket.last_refill = now
+        bucket.last_refill_ns = now
 
     def get_remaining(self, risk_level: str) -> float:
         """Get remaining tokens for a risk level (for diagnostics)."""
-        with self._lock:
-            bucket = self._buckets.get(risk_level)
-            if bucket is None:
-                return 0.0
+        bucket = self._buckets.get(risk_level)
+        if bucket is None:
+            return 0.0
+        with bucket.lock:
             self._refill(bucket)
-            return bucket.tokens
+            return bucket.tokens / _UNITS_PER_TOKEN
 
     def reset(self) -> None:
         """Reset all buckets to full capacity."""
-        with self._lock:
-            self._init_buckets()
+        self._buckets = self._init_buckets()
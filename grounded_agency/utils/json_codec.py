@@ -0,0 +1,123 @@
+"""JSON encoding for state files on hot persistence paths.
+
+Uses ``orjson`` when installed (``pip install grounded-agency[fast]``) and
+falls back to the standard library otherwise.  Both backends produce
+UTF-8 ``bytes`` so callers can write straight to a binary file descriptor
+without a text-layer round trip.
+
+The backends encode the same values the same way: datetimes and
+dataclasses go through ``default`` (as with the stdlib), UUIDs become their
+canonical string and enums their value (as with orjson), and lone
+surrogates (e.g. from ``os.fsdecode`` of a non-UTF-8 path) are written as
+``\\uXXXX`` escapes.
+"""
+
+from __future__ import annotations
+
+import enum
+import json
+import uuid
+from collections.abc import Callable
+from types import ModuleType
+from typing import Any, Final
+
+_orjson: ModuleType | None
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    _orjson = None
+
+HAVE_ORJSON: Final[bool] = _orjson is not None
+
+# Both backends raise a json.JSONDecodeError subclass on malformed input.
+JSONDecodeError = json.JSONDecodeError
+
+
+def _stdlib_dumps(obj: Any, default: Callable[[Any], Any] | None) -> bytes:
+    def fallback(value: Any) -> Any:
+        # Values orjson encodes natively; mirror it so the backends agree.
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if isinstance(value, enum.Enum):
+            return value.value
+        if default is None:
+            raise TypeError(
+                f"Object of type {type(value).__name__} is not JSON serializable"
+            )
+        return default(value)
+
+    # Lone surrogates cannot be UTF-8 encoded; backslashreplace turns each
+    # into its six-byte \uXXXX JSON escape (backslashes in strings are
+    # already escaped by json.dumps, so the result stays valid JSON).
+    return json.dumps(
+        obj, default=fallback, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8", "backslashreplace")
+
+
+if _orjson is not None:
+    _orjson_dumps = _orjson.dumps
+    _orjson_loads = _orjson.loads
+    # Hand datetimes and dataclasses to ``default`` like the stdlib does,
+    # rather than orjson's own formatting.
+    _OPTIONS: Final[int] = (
+        _orjson.OPT_NON_STR_KEYS
+        | _orjson.OPT_PASSTHROUGH_DATETIME
+        | _orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+        """Serialize *obj* to compact UTF-8 JSON bytes.
+
+        Args:
+            obj: Value to serialize.
+            default: Called for values that are not natively serializable;
+                should return a serializable replacement.
+
+        Raises:
+            TypeError: If *obj* contains a value that is not JSON-serializable.
+        """
+        try:
+            encoded: bytes = _orjson_dumps(obj, default=default, option=_OPTIONS)
+        except TypeError:
+            # orjson rejects a few values the stdlib accepts (e.g. integers
+            # wider than 64 bits, strings with lone surrogates); defer to it.
+            return _stdlib_dumps(obj, default)
+        return encoded
+
+    def loads(data: bytes | str) -> Any:
+        """Deserialize JSON *data* (``bytes`` or ``str``).
+
+        Raises:
+            JSONDecodeError: If *data* is not valid JSON.
+        """
+        try:
+            return _orjson_loads(data)
+        except JSONDecodeError:
+            # orjson rejects escaped lone surrogates, which dumps() emits.
+            return json.loads(data)
+
+else:
+
+    def dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+        """Serialize *obj* to compact UTF-8 JSON bytes.
+
+        Args:
+            obj: Value to serialize.
+            default: Called for values that are not natively serializable;
+                should return a serializable replacement.
+
+        Raises:
+            TypeError: If *obj* contains a value that is not JSON-serializable.
+        """
+        return _stdlib_dumps(obj, default)
+
+    def loads(data: bytes | str) -> Any:
+        """Deserialize JSON *data* (``bytes`` or ``str``).
+
+        Raises:
+            JSONDecodeError: If *data* is not valid JSON.
+        """
+        return json.loads(data)
+
+
+__all__ = ["HAVE_ORJSON", "JSONDecodeError", "dumps", "loads"]
@@ -16,7 +16,11 @@ Example:
 from __future__ import annotations
 
 import logging
+import os
 import re
+import stat
+import sys
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -25,6 +29,7 @@ from typing import Any
 from ..capabilities.registry import CapabilityRegistry
 from ..errors import ErrorCode, ValidationError
 from ..state.checkpoint_tracker import CheckpointTracker
+from ..utils import json_codec
 from ..utils.safe_yaml import ONTOLOGY_MAX_BYTES, safe_yaml_load
 
 logger = logging.getLogger(__name__)
@@ -39,6 +44,155 @@ _BINDING_REF_PATTERN = re.compile(
 _MAX_BINDING_DEPTH: int = 50
 _MAX_BINDING_ELEMENTS: int = 10_000
 
+# Declared binding types accepted for each (lowercased) schema type;
+# other schema types only accept themselves.
+_TYPE_ALIASES: dict[str, frozenset[str]] = {
+    "string": frozenset({"string", "str"}),
+    "array": frozenset({"array", "list"}),
+    "object": frozenset({"object", "dict", "map"}),
+    "number": frozenset({"number", "float", "int", "integer"}),
+    "integer": frozenset({"integer", "int", "number"}),
+    "boolean": frozenset({"boolean", "bool"}),
+}
+# The same table as (schema type, declared type) pairs, for one lookup.
+_COMPATIBLE_TYPES: frozenset[tuple[str, str]] = frozenset(
+    (schema, declared)
+    for schema, declared_types in _TYPE_ALIASES.items()
+    for declared in declared_types
+)
+
+# (binding_key, ref_name, base_ref, declared_type) for one ${ref} binding;
+# base_ref is ref_name up to the first dot.
+_BindingRef = tuple[str, str, str, str | None]
+
+# (required, preceding, conflicting, required|preceding set, conflicting
+# set) ontology edge constraints for one capability.
+_EdgeSets = tuple[
+    tuple[str, ...], tuple[str, ...], tuple[str, ...], frozenset[str], frozenset[str]
+]
+
+# Parsed catalogs, kept as compact JSON keyed by absolute path and
+# validated against (inode, mtime_ns, size), so every engine constructed
+# for an unchanged catalog skips YAML parsing and still gets fresh objects.
+_CATALOG_CACHE: dict[str, tuple[tuple[int, int, int], bytes]] = {}
+
+
+def _catalog_stat_key(path: str) -> tuple[int, int, int] | None:
+    """Cache key for a regular, size-permitted catalog file, else None."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode) or st.st_size > ONTOLOGY_MAX_BYTES:
+        return None  # let safe_yaml_load raise the appropriate error
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _load_catalog_data(catalog_path: str | Path) -> Any:
+    """Parse a workflow catalog, reusing the cached parse when unchanged."""
+    abs_path = os.path.abspath(catalog_path)
+    key = _catalog_stat_key(abs_path)
+    if key is not None:
+        cached = _CATALOG_CACHE.get(abs_path)
+        if cached is not None and cached[0] == key:
+            return json_codec.loads(cached[1])
+
+    data = safe_yaml_load(catalog_path, max_size=ONTOLOGY_MAX_BYTES)
+
+    # Only cache when the file did not change while it was being parsed and
+    # the data survives a JSON round trip (no dates, non-string keys, ...).
+    if key is not None and _catalog_stat_key(abs_path) == key:
+        try:
+            encoded = json_codec.dumps(data)
+        except (TypeError, ValueError):
+            encoded = None
+        if encoded is not None and json_codec.loads(encoded) == data:
+            _CATALOG_CACHE[abs_path] = (key, encoded)
+    return data
+
+
+def _extract_binding_refs(
+    bindings: Any, parent_key: str = ""
+) -> list[tuple[str, str, str | None]]:
+    """
+    Extract ${ref} references from binding values.
+
+    Walks the bindings with an explicit stack in the same depth-first
+    order a recursive walk would use, collecting string leaves, then
+    scans them with a single regex pass over a NUL-joined buffer (NUL
+    cannot occur inside a match, so no ref spans two leaves).  Includes
+    depth, cycle, and element-count limits to prevent CPU amplification
+    from YAML alias bombs (shared references that cause exponential
+    traversal).
+
+    Returns:
+        List of (binding_key, ref_name, declared_type) tuples
+
+    Raises:
+        ValueError: If traversal depth or element count exceeds limits
+    """
+    leaf_keys: list[str] = []
+    leaves: list[str] = []
+    visited: set[int] = set()
+    stack: list[tuple[Any, str, int]] = [(bindings, parent_key, 0)]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        node, key, depth = pop()
+        if depth > _MAX_BINDING_DEPTH:
+            raise ValueError(
+                f"Binding traversal exceeded max depth ({_MAX_BINDING_DEPTH})"
+            )
+
+        node_type = type(node)
+        if node_type is str or isinstance(node, str):
+            leaf_keys.append(key)
+            leaves.append(node)
+            continue
+        if node_type is dict or isinstance(node, dict):
+            is_dict = True
+        elif node_type is list or isinstance(node, list):
+            is_dict = False
+        else:
+            continue
+
+        obj_id = id(node)
+        if obj_id in visited:
+            continue
+        visited.add(obj_id)
+        if len(visited) > _MAX_BINDING_ELEMENTS:
+            raise ValueError(
+                f"Binding traversal exceeded max element count "
+                f"({_MAX_BINDING_ELEMENTS})"
+            )
+
+        # Push children in reverse so they are popped in document order.
+        depth += 1
+        if is_dict:
+            for child_key, value in reversed(node.items()):
+                push((value, f"{key}.{child_key}" if key else child_key, depth))
+        else:
+            for idx in range(len(node) - 1, -1, -1):
+                push((node[idx], f"{key}[{idx}]", depth))
+
+    if not leaves:
+        return []
+    # Start offset of each leaf in the joined buffer, for bisect below.
+    starts: list[int] = []
+    offset = 0
+    for leaf in leaves:
+        starts.append(offset)
+        offset += len(leaf) + 1
+    return [
+        (
+            leaf_keys[bisect_right(starts, match.start()) - 1],
+            match.group(1),
+            match.group(2),  # May be None
+        )
+        for match in _BINDING_REF_PATTERN.finditer("\x00".join(leaves))
+    ]
+
 
 class StepStatus(str, Enum):
     """Status of a workflow step during execution."""
@@ -93,6 +247,33 @@ class WorkflowStep:
     input_bindings: dict[str, Any] = field(default_factory=dict)
     gates: list[Gate] = field(default_factory=list)
     failure_modes: list[FailureMode] = field(default_factory=list)
+    # (input_bindings, refs) built lazily by _binding_refs(); rebuilt if
+    # ``input_bindings`` is reassigned.
+    _refs_cache: tuple[Any, tuple[_BindingRef, ...]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _binding_refs(self) -> tuple[_BindingRef, ...]:
+        """Return this step's ``${ref}`` bindings, extracting them once.
+
+        Bindings are static after load, so the binding walk and regex
+        scan run on the first validation only.  ``base_ref`` is interned
+        to match the interned ``store_as`` and input names it is looked
+        up against.  Keyed on the identity of ``input_bindings`` so
+        reassignment is picked up.
+
+        Raises:
+            ValueError: If traversal depth or element count exceeds limits
+        """
+        bindings = self.input_bindings
+        cache = self._refs_cache
+        if cache is None or cache[0] is not bindings:
+            refs = tuple(
+                (key, ref_name, sys.intern(ref_name.split(".", 1)[0]), declared_type)
+                for key, ref_name, declared_type in _extract_binding_refs(bindings)
+            )
+            cache = self._refs_cache = (bindings, refs)
+        return cache[1]
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> WorkflowStep:
@@ -115,6 +296,11 @@ class WorkflowStep:
             for fm in (data.get("failure_modes") or [])
         ]
 
+        # Interned: used as dict keys by binding validation.
+        store_as = data.get("store_as", "")
+        if type(store_as) is str:
+            store_as = sys.intern(store_as)
+
         retry = None
         retry_data = data.get("retry")
         if retry_data and isinstance(retry_data, dict):
@@ -132,7 +318,7 @@ class WorkflowStep:
             requires_approval=data.get("requires_approval", False),
             timeout=data.get("timeout"),
             retry=retry,
-            store_as=data.get("store_as", ""),
+            store_as=store_as,
             domain=data.get("domain"),
             input_bindings=data.get("input_bindings") or {},
             gates=gates,
@@ -158,6 +344,12 @@ class WorkflowDefinition:
     def from_dict(cls, name: str, data: dict[str, Any]) -> WorkflowDefinition:
         """Parse a workflow definition from YAML data."""
         steps = [WorkflowStep.from_dict(s) for s in data.get("steps", [])]
+        inputs = data.get("inputs") or {}
+        if isinstance(inputs, dict):
+            # Interned to match the interned base_ref of each binding.
+            inputs = {
+                sys.intern(k) if type(k) is str else k: v for k, v in inputs.items()
+            }
 
         return cls(
             name=name,
@@ -166,7 +358,7 @@ class WorkflowDefinition:
             steps=steps,
             success=data.get("success") or [],
             description=data.get("description", ""),
-            inputs=data.get("inputs") or {},
+            inputs=inputs,
             risk_propagation=data.get("risk_propagation") or {},
             data_flow=data.get("data_flow") or {},
         )
@@ -198,6 +390,17 @@ class WorkflowStepResult:
     checkpoint_id: str | None = None
 
 
+@dataclass(slots=True)
+class _WorkflowAnalysis:
+    """Results of all per-workflow validators, computed in a single pass."""
+
+    capability_errors: list[str]
+    binding_errors: list[BindingError]
+    edge_errors: list[str]
+    # Traversal-limit error raised while extracting binding refs, if any.
+    binding_failure: ValueError | None = None
+
+
 _ERROR_TYPE_TO_CODE: dict[str, ErrorCode] = {
     "unresolved_ref": ErrorCode.INVALID_BINDING_PATH,
     "type_mismatch": ErrorCode.TYPE_MISMATCH,
@@ -263,6 +466,14 @@ class WorkflowEngine:
         self._registry = CapabilityRegistry(ontology_path)
         self._checkpoint_tracker = checkpoint_tracker
         self._workflows: dict[str, WorkflowDefinition] = {}
+        # Workflow name -> (definition, analysis).  Definitions and the
+        # registry are static once loaded, so each definition is analyzed
+        # once; an entry is stale once the name maps to another object.
+        self._validation_cache: dict[
+            str, tuple[WorkflowDefinition, _WorkflowAnalysis]
+        ] = {}
+        # Capability id -> ontology edge constraints; see _edge_sets().
+        self._edge_cache: dict[str, _EdgeSets] = {}
 
     @property
     def registry(self) -> CapabilityRegistry:
@@ -288,7 +499,8 @@ class WorkflowEngine:
             FileNotFoundError: If catalog file doesn't exist
             ValueError: If catalog is a symlink
         """
-        data: dict[str, Any] = safe_yaml_load(catalog_path, max_size=ONTOLOGY_MAX_BYTES)
+        data: dict[str, Any] = _load_catalog_data(catalog_path)
+        self._validation_cache.clear()
 
         count = 0
         for name, wf_data in data.items():
@@ -325,33 +537,7 @@ class WorkflowEngine:
         workflow = self._workflows.get(workflow_name)
         if workflow is None:
             return [f"Workflow not found: {workflow_name}"]
-
-        errors: list[str] = []
-        for i, step in enumerate(workflow.steps):
-            cap = self._registry.get_capability(step.capability)
-            if cap is None:
-                errors.append(
-                    f"Step {i} ({step.capability}): capability not found in ontology"
-                )
-                continue
-
-            # Cross-reference safety flags against ontology ground truth.
-            # A workflow step must NOT downgrade safety flags that the
-            # ontology declares — doing so could bypass checkpoint
-            # enforcement or hide mutation risk.
-            if cap.mutation and not step.mutation:
-                errors.append(
-                    f"Step {i} ({step.capability}): "
-                    f"ontology declares mutation=true but step "
-                    f"downgrades to mutation=false"
-                )
-            if cap.requires_checkpoint and not step.requires_checkpoint:
-                errors.append(
-                    f"Step {i} ({step.capability}): "
-                    f"ontology declares requires_checkpoint=true but step "
-                    f"downgrades to requires_checkpoint=false"
-                )
-        return errors
+        return list(self._analysis(workflow_name, workflow).capability_errors)
 
     def validate_bindings(self, workflow_name: str) -> list[BindingError]:
         """
@@ -380,27 +566,10 @@ class WorkflowEngine:
                     message=f"Workflow not found: {workflow_name}",
                 )
             ]
-
-        errors: list[BindingError] = []
-
-        # Collect all available store_as names from preceding steps
-        # and workflow input names
-        available_refs: dict[str, int] = {}  # ref_name -> defining step index
-        for input_name in workflow.inputs:
-            available_refs[input_name] = -1  # -1 means workflow input
-
-        for i, step in enumerate(workflow.steps):
-            # Check bindings in this step
-            step_errors = self._validate_step_bindings(
-                workflow_name, i, step, available_refs
-            )
-            errors.extend(step_errors)
-
-            # Register this step's store_as for subsequent steps
-            if step.store_as:
-                available_refs[step.store_as] = i
-
-        return errors
+        analysis = self._analysis(workflow_name, workflow)
+        if analysis.binding_failure is not None:
+            raise analysis.binding_failure
+        return list(analysis.binding_errors)
 
     def _validate_step_bindings(
         self,
@@ -411,12 +580,8 @@ class WorkflowEngine:
     ) -> list[BindingError]:
         """Validate bindings for a single step."""
         errors: list[BindingError] = []
-        refs = self._extract_binding_refs(step.input_bindings)
-
-        for binding_key, ref_name, declared_type in refs:
-            # Split ref_name to get base variable (before any dot-path)
-            base_ref = ref_name.split(".")[0]
 
+        for binding_key, ref_name, base_ref, declared_type in step._binding_refs():
             if base_ref not in available_refs:
                 errors.append(
                     BindingError(
@@ -451,75 +616,8 @@ class WorkflowEngine:
 
         return errors
 
-    def _extract_binding_refs(
-        self,
-        bindings: Any,
-        parent_key: str = "",
-        _depth: int = 0,
-        _visited: set[int] | None = None,
-    ) -> list[tuple[str, str, str | None]]:
-        """
-        Extract ${ref} references from binding values.
-
-        Includes depth, cycle, and element-count limits to prevent CPU
-        amplification from YAML alias bombs (shared references that cause
-        exponential traversal).
-
-        Returns:
-            List of (binding_key, ref_name, declared_type) tuples
-
-        Raises:
-            ValueError: If traversal depth or element count exceeds limits
-        """
-        if _depth > _MAX_BINDING_DEPTH:
-            raise ValueError(
-                f"Binding traversal exceeded max depth ({_MAX_BINDING_DEPTH})"
-            )
-
-        if _visited is None:
-            _visited = set()
-
-        refs: list[tuple[str, str, str | None]] = []
-
-        if isinstance(bindings, str):
-            for match in _BINDING_REF_PATTERN.finditer(bindings):
-                ref_name = match.group(1)
-                declared_type = match.group(2)  # May be None
-                refs.append((parent_key, ref_name, declared_type))
-
-        elif isinstance(bindings, dict):
-            obj_id = id(bindings)
-            if obj_id in _visited:
-                return refs
-            _visited.add(obj_id)
-            if len(_visited) > _MAX_BINDING_ELEMENTS:
-                raise ValueError(
-                    f"Binding traversal exceeded max element count "
-                    f"({_MAX_BINDING_ELEMENTS})"
-                )
-            for key, value in bindings.items():
-                full_key = f"{parent_key}.{key}" if parent_key else key
-                refs.extend(
-                    self._extract_binding_refs(value, full_key, _depth + 1, _visited)
-                )
-
-        elif isinstance(bindings, list):
-            obj_id = id(bindings)
-            if obj_id in _visited:
-                return refs
-            _visited.add(obj_id)
-            if len(_visited) > _MAX_BINDING_ELEMENTS:
-                raise ValueError(
-                    f"Binding traversal exceeded max element count "
-                    f"({_MAX_BINDING_ELEMENTS})"
-                )
-            for idx, item in enumerate(bindings):
-                full_key = f"{parent_key}[{idx}]"
-                refs.extend(
-                    self._extract_binding_refs(item, full_key, _depth + 1, _visited)
-                )
-
-        return refs
+    # Kept on the engine for callers that extract refs from ad-hoc bindings.
+    _extract_binding_refs = staticmethod(_extract_binding_refs)
 
     def _check_type_compatibility(
         self,
@@ -591,22 +689,14 @@ class WorkflowEngine:
 
     def _types_compatible(self, schema_type: str, declared_type: str) -> bool:
         """Check if a schema type is compatible with a declared binding type."""
-        # Normalize common type aliases
-        type_map: dict[str, set[str]] = {
-            "string": {"string", "str"},
-            "array": {"array", "list"},
-            "object": {"object", "dict", "map"},
-            "number": {"number", "float", "int", "integer"},
-            "integer": {"integer", "int", "number"},
-            "boolean": {"boolean", "bool"},
-        }
-
         # Handle parameterized types like array<object>
-        base_declared = declared_type.split("<")[0].split("[")[0].lower()
+        base_declared = declared_type.partition("<")[0].partition("[")[0].lower()
         base_schema = schema_type.lower()
-
-        schema_set = type_map.get(base_schema, {base_schema})
-        return base_declared in schema_set
+        # Every type accepts itself, including ones not in _TYPE_ALIASES.
+        return (
+            base_declared == base_schema
+            or (base_schema, base_declared) in _COMPATIBLE_TYPES
+        )
 
     def validate_edge_constraints(self, workflow_name: str) -> list[str]:
         """
@@ -626,43 +716,139 @@ class WorkflowEngine:
         workflow = self._workflows.get(workflow_name)
         if workflow is None:
             return [f"Workflow not found: {workflow_name}"]
+        return list(self._analysis(workflow_name, workflow).edge_errors)
+
+    def _analysis(
+        self, workflow_name: str, workflow: WorkflowDefinition
+    ) -> _WorkflowAnalysis:
+        """Return the cached analysis of *workflow*, running it if needed."""
+        entry = self._validation_cache.get(workflow_name)
+        if entry is None or entry[0] is not workflow:
+            entry = self._validation_cache[workflow_name] = (
+                workflow,
+                self._analyze(workflow_name, workflow),
+            )
+        return entry[1]
+
+    def _analyze(
+        self, workflow_name: str, workflow: WorkflowDefinition
+    ) -> _WorkflowAnalysis:
+        """Run the capability, binding and edge checks in one pass over steps."""
+        capability_errors: list[str] = []
+        binding_errors: list[BindingError] = []
+        edge_errors: list[str] = []
+        binding_failure: ValueError | None = None
 
-        errors: list[str] = []
+        # Collect all available store_as names from preceding steps
+        # and workflow input names
+        available_refs: dict[str, int] = {}  # ref_name -> defining step index
+        for input_name in workflow.inputs:
+            available_refs[input_name] = -1  # -1 means workflow input
         seen_capabilities: set[str] = set()
+        get_capability = self._registry.get_capability
 
         for i, step in enumerate(workflow.steps):
             cap_id = step.capability
 
-            # Check 'requires' edges
-            required = self._registry.get_required_capabilities(cap_id)
-            for req in required:
-                if req not in seen_capabilities:
-                    errors.append(
-                        f"Step {i} ({cap_id}): requires '{req}' "
-                        f"but it hasn't been executed in prior steps"
+            # --- Capabilities ---
+            cap = get_capability(cap_id)
+            if cap is None:
+                capability_errors.append(
+                    f"Step {i} ({cap_id}): capability not found in ontology"
+                )
+            else:
+                # Cross-reference safety flags against ontology ground truth.
+                # A workflow step must NOT downgrade safety flags that the
+                # ontology declares — doing so could bypass checkpoint
+                # enforcement or hide mutation risk.
+                if cap.mutation and not step.mutation:
+                    capability_errors.append(
+                        f"Step {i} ({cap_id}): "
+                        f"ontology declares mutation=true but step "
+                        f"downgrades to mutation=false"
+                    )
+                if cap.requires_checkpoint and not step.requires_checkpoint:
+                    capability_errors.append(
+                        f"Step {i} ({cap_id}): "
+                        f"ontology declares requires_checkpoint=true but step "
+                        f"downgrades to requires_checkpoint=false"
                     )
 
-            # Check 'precedes' edges
-            preceding = self._registry.get_preceding_capabilities(cap_id)
-            for pred in preceding:
-                if pred not in seen_capabilities:
-                    errors.append(
-                        f"Step {i} ({cap_id}): must be preceded by '{pred}' "
-                        f"but it hasn't been executed in prior steps"
+            # --- Bindings ---
+            # A traversal-limit error is kept for validate_bindings() to
+            # raise, so the other checks still report on this workflow.
+            if binding_failure is None:
+                try:
+                    binding_errors.extend(
+                        self._validate_step_bindings(
+                            workflow_name, i, step, available_refs
+                        )
                     )
+                except ValueError as exc:
+                    binding_failure = exc
+
+            # Register this step's store_as for subsequent steps
+            if step.store_as:
+                available_refs[step.store_as] = i
+
+            # --- Edge constraints ---
+            required, preceding, conflicts, prior, conflicting = self._edge_sets(cap_id)
+
+            # Whole-set checks first; the per-edge loops only run (in
+            # ontology order) when some constraint is actually violated.
+            if not prior <= seen_capabilities:
+                # Check 'requires' edges
+                for req in required:
+                    if req not in seen_capabilities:
+                        edge_errors.append(
+                            f"Step {i} ({cap_id}): requires '{req}' "
+                            f"but it hasn't been executed in prior steps"
+                        )
+
+                # Check 'precedes' edges
+                for pred in preceding:
+                    if pred not in seen_capabilities:
+                        edge_errors.append(
+                            f"Step {i} ({cap_id}): must be preceded by '{pred}' "
+                            f"but it hasn't been executed in prior steps"
+                        )
 
             # Check 'conflicts_with' edges
-            conflicts = self._registry.get_conflicting_capabilities(cap_id)
-            for conflict in conflicts:
-                if conflict in seen_capabilities:
-                    errors.append(
-                        f"Step {i} ({cap_id}): conflicts with '{conflict}' "
-                        f"which was already executed"
-                    )
+            if not conflicting.isdisjoint(seen_capabilities):
+                for conflict in conflicts:
+                    if conflict in seen_capabilities:
+                        edge_errors.append(
+                            f"Step {i} ({cap_id}): conflicts with '{conflict}' "
+                            f"which was already executed"
+                        )
 
             seen_capabilities.add(cap_id)
 
-        return errors
+        return _WorkflowAnalysis(
+            capability_errors, binding_errors, edge_errors, binding_failure
+        )
+
+    def _edge_sets(self, cap_id: str) -> _EdgeSets:
+        """Return the ontology edge constraints for *cap_id*, built once.
+
+        The registry is static, so the edge lists are fetched on first use
+        and kept with a frozenset of all required/preceding capabilities
+        and one of the conflicting ones for C-level subset/disjoint checks.
+        """
+        edge_sets = self._edge_cache.get(cap_id)
+        if edge_sets is None:
+            registry = self._registry
+            required = tuple(registry.get_required_capabilities(cap_id))
+            preceding = tuple(registry.get_preceding_capabilities(cap_id))
+            conflicts = tuple(registry.get_conflicting_capabilities(cap_id))
+            edge_sets = self._edge_cache[cap_id] = (
+                required,
+                preceding,
+                conflicts,
+                frozenset(required + preceding),
+                frozenset(conflicts),
+            )
+        return edge_sets
 
     def ensure_checkpoint_before_step(
         self,
@@ -732,6 +918,13 @@ class WorkflowEngine:
                 results[name] = errors
         return results
 
+    def validate_all_json(self) -> bytes:
+        """Run validate_all() and encode the result as compact UTF-8 JSON.
+
+        Uses orjson when installed (see :mod:`grounded_agency.utils.json_codec`).
+        """
+        return json_codec.dumps(self.validate_all())
+
     def validate_all_structured(self) -> dict[str, list[ValidationError]]:
         """Run all validations, returning structured ValidationError objects.
 
@@ -155,3 +155,14 @@ class TestMarkerFileOverwrite:
         tracker = CheckpointTracker(marker_dir=new_dir)
         tracker.create_checkpoint(scope=["*"], reason="test")
         assert (new_dir / "checkpoint.ok").exists()
+
+    def test_marker_dir_recreated_after_external_removal(
+        self, tracker: CheckpointTracker, marker_dir: Path
+    ) -> None:
+        import shutil
+
+        tracker.create_checkpoint(scope=["*"], reason="first")
+        shutil.rmtree(marker_dir)
+        chk_id = tracker.create_checkpoint(scope=["*"], reason="second")
+        data = json.loads((marker_dir / "checkpoint.ok").read_text(encoding="utf-8"))
+        assert data["checkpoint_id"] == chk_id
@@ -0,0 +1,659 @@
+"""Tests for CheckpointTracker hot-path optimizations.
+
+Covers the caches and indexes used on the pre-mutation critical path
+and verifies they never change the tracker's observable behaviour.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import gc
+import json
+import weakref
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from grounded_agency.state import checkpoint_tracker
+from grounded_agency.state.checkpoint_tracker import Checkpoint, CheckpointTracker
+
+
+@pytest.fixture
+def tracker(tmp_path: Path) -> CheckpointTracker:
+    """Create a tracker backed by a temporary checkpoint directory."""
+    return CheckpointTracker(checkpoint_dir=tmp_path / "checkpoints")
+
+
+class TestValidityCache:
+    """Tests for the short-lived has_valid_checkpoint() result cache."""
+
+    def test_consume_invalidates_immediately(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="test")
+        assert tracker.has_valid_checkpoint()
+        tracker.consume_checkpoint()
+        assert not tracker.has_valid_checkpoint()
+
+    def test_invalidate_all_invalidates_immediately(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="test")
+        assert tracker.has_valid_checkpoint()
+        tracker.invalidate_all()
+        assert not tracker.has_valid_checkpoint()
+        assert tracker.validate_and_reserve() == (False, None)
+
+    def test_new_checkpoint_misses_cache(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["src/*.py"], reason="first")
+        assert tracker.has_checkpoint_for_scope("src/a.py")
+        second = tracker.create_checkpoint(scope=["docs/*"], reason="second")
+        assert not tracker.has_checkpoint_for_scope("src/a.py")
+        assert tracker.validate_and_reserve() == (True, second)
+
+    def test_cache_window_never_outlives_expiry(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="test")
+        active = tracker._active_checkpoint
+        assert active is not None
+        assert tracker.has_valid_checkpoint()
+        active.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        assert not active.is_valid()
+        assert not tracker.has_valid_checkpoint()
+
+
+class TestHistoryQueries:
+    """Tests for get_history() and get_checkpoint_by_id()."""
+
+    def test_get_history_most_recent_first(self, tracker: CheckpointTracker) -> None:
+        ids = [tracker.create_checkpoint(scope=["*"], reason=f"c{i}") for i in range(5)]
+        history = tracker.get_history(limit=3)
+        assert [c.id for c in history] == ids[::-1][:3]
+
+    def test_get_history_includes_active(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="old")
+        active_id = tracker.create_checkpoint(scope=["*"], reason="active")
+        assert tracker.get_history(limit=1)[0].id == active_id
+
+    def test_get_history_limit_exceeds_size(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="only")
+        assert len(tracker.get_history(limit=50)) == 1
+
+    def test_get_history_empty(self, tracker: CheckpointTracker) -> None:
+        assert tracker.get_history() == []
+
+    def test_get_history_non_positive_limit(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        assert tracker.get_history(limit=0) == []
+
+    @pytest.mark.parametrize("limit", [1, 2, 3, 4])
+    def test_get_history_ties_match_full_sort(
+        self, tracker: CheckpointTracker, limit: int
+    ) -> None:
+        for i in range(4):
+            tracker.create_checkpoint(scope=["*"], reason=f"c{i}")
+        active = tracker._active_checkpoint
+        assert active is not None
+        entries = [*tracker._checkpoint_history, active]
+        same = entries[1].created_at
+        for c in entries[1:]:
+            c.created_at = same
+        expected = sorted(entries, key=lambda c: c.created_at, reverse=True)[:limit]
+        assert tracker.get_history(limit=limit) == expected
+
+    def test_get_history_unordered_loaded_history(self, tmp_path: Path) -> None:
+        chk_dir = tmp_path / "checkpoints"
+        tracker1 = CheckpointTracker(checkpoint_dir=chk_dir)
+        ids = [
+            tracker1.create_checkpoint(scope=["*"], reason=f"c{i}") for i in range(4)
+        ]
+        tracker1._checkpoint_history.reverse()
+        tracker1._last_persisted = None
+        tracker1._persist_state()
+
+        tracker2 = CheckpointTracker(checkpoint_dir=chk_dir)
+        assert not tracker2._history_ordered
+        assert [c.id for c in tracker2.get_history(limit=3)] == ids[::-1][:3]
+
+    def test_get_checkpoint_by_id_finds_history_entries(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        ids = [tracker.create_checkpoint(scope=["*"], reason=f"c{i}") for i in range(4)]
+        for chk_id in ids:
+            found = tracker.get_checkpoint_by_id(chk_id)
+            assert found is not None and found.id == chk_id
+        assert tracker.get_checkpoint_by_id("chk_00000000_000000_missing") is None
+
+    def test_get_checkpoint_by_id_after_prune(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", max_history=2
+        )
+        ids = [tracker.create_checkpoint(scope=["*"], reason=f"c{i}") for i in range(5)]
+        assert tracker.get_checkpoint_by_id(ids[0]) is None
+        assert tracker.get_checkpoint_by_id(ids[1]) is None
+        assert all(tracker.get_checkpoint_by_id(i) is not None for i in ids[2:])
+
+    def test_get_checkpoint_by_id_after_clear_expired(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        old = tracker.create_checkpoint(scope=["*"], reason="old", expiry_minutes=0)
+        live = tracker.create_checkpoint(scope=["*"], reason="live")
+        assert tracker.clear_expired() == 1
+        assert tracker.get_checkpoint_by_id(old) is None
+        assert tracker.get_checkpoint_by_id(live) is not None
+
+    def test_get_checkpoint_by_id_after_reload(self, tmp_path: Path) -> None:
+        chk_dir = tmp_path / "checkpoints"
+        tracker1 = CheckpointTracker(checkpoint_dir=chk_dir)
+        first = tracker1.create_checkpoint(scope=["*"], reason="a")
+        active = tracker1.create_checkpoint(scope=["*"], reason="b")
+
+        tracker2 = CheckpointTracker(checkpoint_dir=chk_dir)
+        assert tracker2.get_checkpoint_by_id(first) is tracker2._checkpoint_history[0]
+        assert tracker2.get_checkpoint_by_id(active) is tracker2._active_checkpoint
+
+
+class TestClearExpired:
+    """Tests for clear_expired() over cached expiry epochs."""
+
+    def test_expired_prefix_is_trimmed(self, tracker: CheckpointTracker) -> None:
+        for i in range(2):
+            tracker.create_checkpoint(scope=["*"], reason=f"old{i}", expiry_minutes=0)
+        for i in range(3):
+            tracker.create_checkpoint(scope=["*"], reason=f"new{i}")
+        assert tracker.clear_expired() == 2
+        assert [c.reason for c in tracker._checkpoint_history] == ["new0", "new1"]
+
+    def test_mixed_expiry_removes_only_expired(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="long", expiry_minutes=60)
+        short = tracker.create_checkpoint(scope=["*"], reason="short", expiry_minutes=0)
+        tracker.create_checkpoint(scope=["*"], reason="active")
+        assert tracker.clear_expired() == 1
+        assert [c.reason for c in tracker._checkpoint_history] == ["long"]
+        assert tracker.get_checkpoint_by_id(short) is None
+
+    def test_nothing_expired_is_noop(self, tracker: CheckpointTracker) -> None:
+        for i in range(3):
+            tracker.create_checkpoint(scope=["*"], reason=f"c{i}")
+        assert tracker.clear_expired() == 0
+        assert len(tracker._checkpoint_history) == 2
+
+    def test_loaded_history_expiry(self, tmp_path: Path) -> None:
+        chk_dir = tmp_path / "checkpoints"
+        tracker1 = CheckpointTracker(checkpoint_dir=chk_dir)
+        tracker1.create_checkpoint(scope=["*"], reason="a", expiry_minutes=60)
+        tracker1.create_checkpoint(scope=["*"], reason="b", expiry_minutes=0)
+        tracker1.create_checkpoint(scope=["*"], reason="c")
+
+        tracker2 = CheckpointTracker(checkpoint_dir=chk_dir)
+        assert tracker2.clear_expired() == 1
+        assert [c.reason for c in tracker2._checkpoint_history] == ["a"]
+
+    def test_pruned_entries_do_not_count(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", max_history=2
+        )
+        for i in range(50):
+            tracker.create_checkpoint(scope=["*"], reason=f"c{i}", expiry_minutes=0)
+        # Two retained history entries plus the expired active checkpoint.
+        assert tracker.clear_expired() == 3
+        assert tracker._checkpoint_history == []
+
+    def test_expiry_moved_into_past_is_cleared(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a", expiry_minutes=60)
+        tracker.create_checkpoint(scope=["*"], reason="active")
+        entry = tracker._checkpoint_history[0]
+        entry.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        assert tracker.clear_expired() == 1
+        assert tracker._checkpoint_history == []
+
+    def test_expiry_moved_into_future_is_kept(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a", expiry_minutes=0)
+        tracker.create_checkpoint(scope=["*"], reason="active")
+        entry = tracker._checkpoint_history[0]
+        entry.expires_at = datetime.now(timezone.utc) + timedelta(minutes=60)
+        assert tracker.clear_expired() == 0
+        assert tracker._checkpoint_history == [entry]
+
+
+class TestScopeInterning:
+    """Tests for shared scope/reason strings across checkpoints."""
+
+    def test_loaded_scopes_share_strings(self, tmp_path: Path) -> None:
+        chk_dir = tmp_path / "checkpoints"
+        tracker1 = CheckpointTracker(checkpoint_dir=chk_dir)
+        for _ in range(3):
+            tracker1.create_checkpoint(scope=["src/" + "*.py"], reason="same")
+
+        tracker2 = CheckpointTracker(checkpoint_dir=chk_dir)
+        first, second = tracker2._checkpoint_history[:2]
+        assert first.scope[0] is second.scope[0]
+        assert first.reason is second.reason
+
+    def test_scope_is_copied_from_caller(self, tracker: CheckpointTracker) -> None:
+        scope = ["src/*.py"]
+        tracker.create_checkpoint(scope=scope, reason="copy")
+        scope.append("*")
+        assert not tracker.has_checkpoint_for_scope("docs/readme.md")
+
+
+class TestDefaultMetadata:
+    """Tests for the per-checkpoint default metadata dict."""
+
+    def test_default_metadata_is_per_instance(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.create_checkpoint(scope=["*"], reason="b")
+        first = tracker._checkpoint_history[0]
+        active = tracker._active_checkpoint
+        assert active is not None
+        assert first.metadata == {}
+        assert first.metadata is not active.metadata
+
+    def test_default_metadata_is_mutable(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker._persist_state()
+        active = tracker._active_checkpoint
+        assert active is not None
+        active.metadata["key"] = "value"
+        tracker._persist_state()
+        state = json.loads(
+            (tmp_path / "checkpoints" / "tracker_state.json").read_text("utf-8")
+        )
+        assert state["active"]["metadata"] == {"key": "value"}
+
+    def test_loaded_metadata_is_dict(self, tmp_path: Path) -> None:
+        chk_dir = tmp_path / "checkpoints"
+        tracker1 = CheckpointTracker(checkpoint_dir=chk_dir)
+        tracker1.create_checkpoint(scope=["*"], reason="a")
+        tracker1.create_checkpoint(scope=["*"], reason="b", metadata={"k": 1})
+
+        tracker2 = CheckpointTracker(checkpoint_dir=chk_dir)
+        (plain,) = tracker2._checkpoint_history
+        active = tracker2._active_checkpoint
+        assert active is not None
+        assert type(plain.metadata) is dict
+        assert plain.metadata == {}
+        assert active.metadata == {"k": 1}
+
+
+class TestRetainConsumed:
+    """Tests for the retain_consumed history option."""
+
+    def test_consumed_kept_by_default(self, tracker: CheckpointTracker) -> None:
+        chk_id = tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.consume_checkpoint()
+        assert [c.id for c in tracker._checkpoint_history] == [chk_id]
+
+    def test_consumed_dropped_when_disabled(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", retain_consumed=False
+        )
+        chk_id = tracker.create_checkpoint(scope=["*"], reason="a")
+        assert tracker.consume_checkpoint() is not None
+        assert tracker._checkpoint_history == []
+        assert not tracker.has_valid_checkpoint()
+        assert tracker.get_checkpoint_by_id(chk_id) is None
+
+    def test_replaced_checkpoint_still_recorded(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", retain_consumed=False
+        )
+        first = tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.create_checkpoint(scope=["*"], reason="b")
+        assert tracker.get_checkpoint_by_id(first) is not None
+
+
+class TestIsoformatCache:
+    """Tests for memoized timestamp formatting in Checkpoint.to_dict()."""
+
+    def test_repeated_to_dict_is_stable(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        active = tracker._active_checkpoint
+        assert active is not None
+        assert active.to_dict() == active.to_dict()
+        assert active.to_dict() is not active.to_dict()
+
+    def test_reassigned_fields_are_reformatted(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        active = tracker._active_checkpoint
+        assert active is not None
+        active.to_dict()
+        new_expiry = datetime.now(timezone.utc) + timedelta(hours=2)
+        active.expires_at = new_expiry
+        assert active.to_dict()["expires_at"] == new_expiry.isoformat()
+
+    def test_consume_updates_serialized_form(self, tracker: CheckpointTracker) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        active = tracker._active_checkpoint
+        assert active is not None
+        assert active.to_dict()["consumed_at"] is None
+        tracker.consume_checkpoint()
+        d = active.to_dict()
+        assert d["consumed"] is True
+        assert d["consumed_at"] is not None
+
+
+class TestEncodedStateCache:
+    """Tests for per-checkpoint cached encodings in _persist_state()."""
+
+    def _state(self, tmp_path: Path) -> dict[str, Any]:
+        return json.loads(
+            (tmp_path / "checkpoints" / "tracker_state.json").read_text("utf-8")
+        )
+
+    def test_state_file_matches_to_dict(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.consume_checkpoint()
+        tracker.create_checkpoint(scope=["src/*"], reason="b", metadata={"k": 1})
+        state = self._state(tmp_path)
+        active = tracker._active_checkpoint
+        assert active is not None
+        assert state["active"] == active.to_dict()
+        assert state["history"] == [c.to_dict() for c in tracker._checkpoint_history]
+
+    def test_empty_state_file(self, tracker: CheckpointTracker, tmp_path: Path) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.invalidate_all()
+        tracker._checkpoint_history.clear()
+        tracker._persist_state()
+        assert self._state(tmp_path) == {"active": None, "history": []}
+
+    def test_consumed_entry_is_reencoded(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.consume_checkpoint()
+        assert self._state(tmp_path)["history"][0]["consumed"] is True
+
+    def test_mutated_metadata_is_reencoded(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        metadata: dict[str, Any] = {"step": 1}
+        tracker.create_checkpoint(scope=["*"], reason="a", metadata=metadata)
+        metadata["step"] = 2
+        tracker._persist_state()
+        assert self._state(tmp_path)["active"]["metadata"] == {"step": 2}
+
+    def test_reassigned_metadata_is_reencoded(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.consume_checkpoint()
+        entry = tracker._checkpoint_history[0]
+        entry.metadata = {"audit": "late"}
+        tracker._persist_state()
+        assert self._state(tmp_path)["history"][0]["metadata"] == {"audit": "late"}
+
+    def test_reassigned_reason_and_scope_are_reencoded(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["src/*.py"], reason="first")
+        tracker.consume_checkpoint()
+        entry = tracker._checkpoint_history[0]
+        entry.reason = "EDITED"
+        entry.scope = ["changed/*"]
+        tracker._persist_state()
+        saved = self._state(tmp_path)["history"][0]
+        assert (saved["reason"], saved["scope"]) == ("EDITED", ["changed/*"])
+
+    def test_scope_edited_in_place_is_reencoded(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["src/*.py"], reason="a")
+        tracker.consume_checkpoint()
+        tracker._checkpoint_history[0].scope.append("docs/*")
+        tracker._persist_state()
+        assert self._state(tmp_path)["history"][0]["scope"] == ["src/*.py", "docs/*"]
+
+
+class TestCompiledScope:
+    """Tests for precompiled scope matching in Checkpoint.matches_scope()."""
+
+    def _checkpoint(self, scope: list[str]) -> Checkpoint:
+        return Checkpoint(
+            id="chk_test",
+            scope=scope,
+            reason="test",
+            created_at=datetime.now(timezone.utc),
+        )
+
+    @pytest.mark.parametrize(
+        ("pattern", "target"),
+        [
+            ("src/*.py", "src/a.py"),
+            ("src/*.py", "src/pkg/a.py"),
+            ("src/?.py", "src/ab.py"),
+            ("docs/[abc]*.md", "docs/api.md"),
+            ("docs/[!abc]*.md", "docs/api.md"),
+            ("exact.txt", "exact.txt"),
+            ("a.b", "aXb"),
+        ],
+    )
+    def test_matches_like_fnmatch(self, pattern: str, target: str) -> None:
+        cp = self._checkpoint([pattern])
+        assert cp.matches_scope(target) == fnmatch.fnmatch(target, pattern)
+
+    @pytest.mark.parametrize(
+        "target",
+        ["src/a.py", "lib/b.js", "docs/c.md", "tests/test_x.py", "other/d.txt"],
+    )
+    def test_union_regex_matches_like_fnmatch(self, target: str) -> None:
+        scope = ["src/*.py", "lib/*.js", "docs/[a-c].md", "tests/test_*.py"]
+        cp = self._checkpoint(scope)
+        expected = any(fnmatch.fnmatch(target, p) for p in scope)
+        assert cp.matches_scope(target) == expected
+        assert cp._scope_plan is not None and len(cp._scope_plan[3]) == 1
+
+    def test_wildcard_matches_everything(self) -> None:
+        assert self._checkpoint(["docs/*", "*"]).matches_scope("any/thing")
+
+    def test_equal_scopes_share_compiled_matchers(self) -> None:
+        first = self._checkpoint(["src/*.py", "docs/*"])
+        second = self._checkpoint(["src/*.py", "docs/*"])
+        first.matches_scope("src/a.py")
+        second.matches_scope("src/a.py")
+        assert first._scope_plan is not None and second._scope_plan is not None
+        assert first._scope_plan[3] is second._scope_plan[3]
+
+    def test_reassigned_scope_is_recompiled(self) -> None:
+        cp = self._checkpoint(["src/*"])
+        assert cp.matches_scope("src/a.py")
+        cp.scope = ["docs/*"]
+        assert not cp.matches_scope("src/a.py")
+        assert cp.matches_scope("docs/a.md")
+
+
+class TestDeferredPersistence:
+    """Tests for opt-in coalesced state writes (persist_delay)."""
+
+    def _state_path(self, tmp_path: Path) -> Path:
+        return tmp_path / "checkpoints" / "tracker_state.json"
+
+    def test_writes_are_deferred_until_flush(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", persist_delay=60
+        )
+        chk_id = tracker.create_checkpoint(scope=["*"], reason="a")
+        assert not self._state_path(tmp_path).exists()
+        tracker.flush()
+        state = json.loads(self._state_path(tmp_path).read_text("utf-8"))
+        assert state["active"]["id"] == chk_id
+        assert tracker._persist_timer is None
+
+    def test_timer_writes_pending_state(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", persist_delay=0.01
+        )
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        timer = tracker._persist_timer
+        assert timer is not None
+        timer.join(timeout=5)
+        assert self._state_path(tmp_path).exists()
+
+    def test_invalidate_all_writes_immediately(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", persist_delay=60
+        )
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.invalidate_all()
+        state = json.loads(self._state_path(tmp_path).read_text("utf-8"))
+        assert state["active"] is None
+        assert state["history"][0]["consumed"] is True
+        tracker.flush()
+
+    def test_exit_hook_flushes_pending_trackers(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", persist_delay=60
+        )
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        assert tracker in checkpoint_tracker._pending_flush
+        checkpoint_tracker._flush_pending()
+        assert self._state_path(tmp_path).exists()
+        assert tracker not in checkpoint_tracker._pending_flush
+
+    def test_flushed_tracker_is_not_kept_alive(self, tmp_path: Path) -> None:
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", persist_delay=60
+        )
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        timer = tracker._persist_timer
+        assert timer is not None
+        tracker.flush()
+        timer.join(timeout=5)
+        del timer
+        ref = weakref.ref(tracker)
+        del tracker
+        gc.collect()
+        assert ref() is None
+
+    def test_default_writes_synchronously(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        assert self._state_path(tmp_path).exists()
+        assert tracker._persist_timer is None
+
+
+class TestCachedTimestamps:
+    """Tests for cached unix timestamps on Checkpoint."""
+
+    def test_is_valid_tracks_reassigned_expiry(
+        self, tracker: CheckpointTracker
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        active = tracker._active_checkpoint
+        assert active is not None
+        assert active.is_valid()
+        active.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        assert not active.is_valid()
+
+    def test_create_uses_single_clock_reading(self, tracker: CheckpointTracker) -> None:
+        chk_id = tracker.create_checkpoint(scope=["*"], reason="a")
+        active = tracker._active_checkpoint
+        assert active is not None
+        assert active.expires_at == active.created_at + timedelta(
+            minutes=CheckpointTracker.DEFAULT_EXPIRY_MINUTES
+        )
+        assert chk_id.startswith(active.created_at.strftime("chk_%Y%m%d_%H%M%S_"))
+
+    def test_marker_uses_cached_timestamps(self, tmp_path: Path) -> None:
+        marker_dir = tmp_path / ".claude"
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", marker_dir=marker_dir
+        )
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        active = tracker._active_checkpoint
+        assert active is not None
+        data = json.loads((marker_dir / "checkpoint.ok").read_text("utf-8"))
+        assert data["created_at"] == int(active.created_at.timestamp())
+        assert active.expires_at is not None
+        assert data["expires_at"] == int(active.expires_at.timestamp())
+
+
+class TestFixedTempFiles:
+    """Tests for the fixed per-instance temp file used by atomic writes."""
+
+    def test_leftover_tmp_is_replaced(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        chk_dir = tmp_path / "checkpoints"
+        chk_dir.mkdir()
+        Path(tracker._state_tmp_str).write_bytes(b"partial")
+        chk_id = tracker.create_checkpoint(scope=["*"], reason="a")
+        state = json.loads((chk_dir / "tracker_state.json").read_text("utf-8"))
+        assert state["active"]["id"] == chk_id
+        assert list(chk_dir.glob("*.tmp")) == []
+
+    def test_repeated_writes_leave_no_tmp(self, tmp_path: Path) -> None:
+        marker_dir = tmp_path / ".claude"
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", marker_dir=marker_dir
+        )
+        for i in range(3):
+            tracker.create_checkpoint(scope=["*"], reason=f"c{i}")
+        assert list((tmp_path / "checkpoints").glob("*.tmp")) == []
+        assert list(marker_dir.glob("*.tmp")) == []
+
+
+class TestUnchangedStateSkip:
+    """Tests for skipping state writes that would not change the file."""
+
+    def test_unchanged_state_is_not_rewritten(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        state_file = tmp_path / "checkpoints" / "tracker_state.json"
+        state_file.write_text("sentinel", encoding="utf-8")
+        tracker._persist_state()
+        assert state_file.read_text(encoding="utf-8") == "sentinel"
+
+    def test_changed_state_is_written(
+        self, tracker: CheckpointTracker, tmp_path: Path
+    ) -> None:
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        tracker.consume_checkpoint()
+        state_file = tmp_path / "checkpoints" / "tracker_state.json"
+        state = json.loads(state_file.read_text(encoding="utf-8"))
+        assert state["active"] is None
+        assert state["history"][0]["consumed"] is True
+
+
+class TestMarkerSync:
+    """Tests for _sync_marker() keeping the marker in step with state."""
+
+    def test_repeat_sync_skips_filesystem(self, tmp_path: Path) -> None:
+        marker_dir = tmp_path / ".claude"
+        tracker = CheckpointTracker(
+            checkpoint_dir=tmp_path / "checkpoints", marker_dir=marker_dir
+        )
+        tracker.create_checkpoint(scope=["*"], reason="a")
+        marker = marker_dir / "checkpoint.ok"
+        marker.write_text("sentinel", encoding="utf-8")
+        tracker._sync_marker()
+        assert marker.read_text(encoding="utf-8") == "sentinel"
+
+    def test_first_sync_after_restart_removes_stale_marker(
+        self, tmp_path: Path
+    ) -> None:
+        marker_dir = tmp_path / ".claude"
+        chk_dir = tmp_path / "checkpoints"
+        tracker1 = CheckpointTracker(checkpoint_dir=chk_dir, marker_dir=marker_dir)
+        tracker1.create_checkpoint(scope=["*"], reason="a")
+        tracker1.invalidate_all()
+        (marker_dir / "checkpoint.ok").write_text("{}", encoding="utf-8")
+
+        tracker2 = CheckpointTracker(checkpoint_dir=chk_dir, marker_dir=marker_dir)
+        tracker2.create_checkpoint(scope=["*"], reason="b")
+        tracker2.consume_checkpoint()
+        assert not (marker_dir / "checkpoint.ok").exists()
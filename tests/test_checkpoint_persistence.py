@@ -7,6 +7,7 @@ restore it in a new instance, surviving process restarts.
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -119,6 +120,19 @@ class TestCrossInstanceRestore:
         assert active is not None
         assert active.metadata == {"tool": "Edit", "path": "foo.py"}
 
+    def test_restore_undecodable_path_scope(self, chk_dir: Path) -> None:
+        # A non-UTF-8 filename decodes to a lone surrogate on POSIX
+        scope = os.fsdecode(b"src/\xff.py")
+        tracker1 = CheckpointTracker(checkpoint_dir=chk_dir)
+        chk_id = tracker1.create_checkpoint(scope=[scope], reason="surrogate")
+
+        state = json.loads((chk_dir / "tracker_state.json").read_bytes())
+        assert state["active"]["scope"] == [scope]
+
+        tracker2 = CheckpointTracker(checkpoint_dir=chk_dir)
+        assert tracker2.get_active_checkpoint_id() == chk_id
+        assert tracker2.has_checkpoint_for_scope(scope)
+
 
 class TestCorruptStateHandling:
     """Tests for graceful handling of corrupt/missing state files."""
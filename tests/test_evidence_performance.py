@@ -6,11 +6,20 @@ tests secondary index consistency after eviction.
 
 from __future__ import annotations
 
+import importlib
+import io
 import json
+import os
+import sys
 import time
+import uuid
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator
+from datetime import datetime, timezone
 
 import pytest
 
+from grounded_agency.state import evidence_store
 from grounded_agency.state.evidence_store import (
     _MAX_METADATA_SIZE_BYTES,
     PRIORITY_CRITICAL,
@@ -19,10 +28,12 @@ from grounded_agency.state.evidence_store import (
     PRIORITY_NORMAL,
     EvidenceAnchor,
     EvidenceStore,
+    _json_size_bound,
     _sanitize_metadata,
     _validate_metadata_depth,
     _validate_metadata_key,
 )
+from grounded_agency.utils import json_codec
 
 # ─── SEC-008: Metadata key denylist tests ───
 
@@ -68,6 +79,12 @@ class TestMetadataKeyDenylist:
     def test_allows_max_length_key(self) -> None:
         assert _validate_metadata_key("a" * 64) is True
 
+    @pytest.mark.parametrize(
+        "key", ["", "1abc", "has-dash", "has space", "trailing\n", "ünicode"]
+    )
+    def test_rejects_non_identifier_key(self, key: str) -> None:
+        assert _validate_metadata_key(key) is False
+
     def test_anchor_strips_denied_keys(self) -> None:
         """EvidenceAnchor sanitization should drop denied keys."""
         anchor = EvidenceAnchor(
@@ -114,6 +131,23 @@ class TestMetadataSanitization:
         value = {"items": [{"nested": {"deep": True}}]}
         assert _validate_metadata_depth(value) is False
 
+    def test_empty_containers_at_limit_pass(self) -> None:
+        """Empty containers at max depth have no children to exceed it."""
+        assert _validate_metadata_depth({"a": {"b": {}}}) is True
+        assert _validate_metadata_depth([[[]]]) is True
+        assert _validate_metadata_depth({"a": {"b": {"c": 1}}}) is False
+
+    def test_container_subclasses_are_checked(self) -> None:
+        """dict/list subclasses cannot bypass the depth limit."""
+        assert _validate_metadata_depth(OrderedDict(a={"b": {"c": 1}})) is False
+        assert _validate_metadata_depth(defaultdict(list, a=[[1]])) is False
+        assert _validate_metadata_depth(OrderedDict(a=[1])) is True
+
+    def test_circular_reference_terminates(self) -> None:
+        circular: list = []
+        circular.append(circular)
+        assert _validate_metadata_depth(circular) is False
+
     def test_scalar_always_passes(self) -> None:
         assert _validate_metadata_depth("hello") is True
         assert _validate_metadata_depth(42) is True
@@ -155,6 +189,26 @@ class TestMetadataSanitization:
         truncated_overhead = len(json.dumps({"key": "[truncated]"}).encode("utf-8"))
         assert serialized <= _MAX_METADATA_SIZE_BYTES + truncated_overhead
 
+    def test_truncates_largest_values_first(self) -> None:
+        """Only as many of the largest values as needed are truncated."""
+        meta = {"small": "keep", "big": "x" * 900, "medium": "y" * 300}
+        result = _sanitize_metadata(meta)
+        assert result == {"small": "keep", "big": "[truncated]", "medium": "y" * 300}
+        assert len(json_codec.dumps(result)) <= _MAX_METADATA_SIZE_BYTES
+
+    def test_many_keys_fit_by_dropping_entries(self) -> None:
+        """Metadata that cannot fit by truncation alone still terminates."""
+        meta = {f"key_{i:03d}": i for i in range(200)}
+        result = _sanitize_metadata(meta)
+        assert 0 < len(result) < 200
+        assert len(json_codec.dumps(result)) <= _MAX_METADATA_SIZE_BYTES
+
+    def test_keys_are_interned(self) -> None:
+        """Sanitized keys built at runtime share the interned string."""
+        key = "".join(["tool", "_name"])
+        result = _sanitize_metadata({key: "Read"})
+        assert next(iter(result)) is sys.intern("tool_name")
+
     def test_circular_reference_flattened(self) -> None:
         """Circular-reference metadata should be depth-flattened, not crash."""
         circular: dict = {"key": "value"}
@@ -170,6 +224,149 @@ class TestMetadataSanitization:
         result = _sanitize_metadata(meta)
         assert result == meta
 
+    def test_small_metadata_skips_serialization(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Metadata provably under the limit should not be JSON-encoded."""
+
+        def fail(*args: object, **kwargs: object) -> bytes:
+            raise AssertionError("dumps should not be called")
+
+        monkeypatch.setattr(evidence_store.json_codec, "dumps", fail)
+        meta = {"tool_name": "Read", "path": "/tmp/file.py", "nested": {"n": [1]}}
+        assert _sanitize_metadata(meta) == meta
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "plain",
+            'quo"te\\s',
+            "ctrl\x00\x1f",
+            "ünïcødé 🚀",
+            os.fsdecode(b"src/\xff.py"),
+            2**63,
+            -(2**63),
+            -1.2345678901234567e-308,
+            True,
+            None,
+            {"a": [1, "b", None], "c": {"d": 1.5}},
+            ("t", 1),
+        ],
+    )
+    def test_size_bound_never_underestimates(self, value: object) -> None:
+        bound = _json_size_bound(value, _MAX_METADATA_SIZE_BYTES)
+        assert bound >= len(json_codec.dumps(value))
+
+    def test_size_bound_defers_non_native_values(self) -> None:
+        budget = _MAX_METADATA_SIZE_BYTES
+        assert _json_size_bound(object(), budget) > budget
+        assert _json_size_bound(2**70, budget) > budget
+        assert _json_size_bound({1: "int key"}, budget) > budget
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec_backend(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[str]:
+    """Run a test against each JSON codec backend."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        importlib.reload(json_codec)
+    yield request.param
+    monkeypatch.undo()
+    importlib.reload(json_codec)
+
+
+class TestMetadataEncodingBackends:
+    """Metadata sizing and export agree across JSON codec backends."""
+
+    _PATH = os.fsdecode(b"src/\xff.py")
+    _WHEN = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    def test_oversized_metadata_with_surrogate_keeps_keys(
+        self, codec_backend: str
+    ) -> None:
+        meta = {
+            "tool_name": "Read",
+            "path": self._PATH,
+            "when": self._WHEN,
+            "blob": "x" * (_MAX_METADATA_SIZE_BYTES + 10),
+        }
+        result = _sanitize_metadata(meta)
+        assert result == {
+            "tool_name": "Read",
+            "path": self._PATH,
+            "when": self._WHEN,
+            "blob": "[truncated]",
+        }
+
+    def test_to_json_bytes_with_surrogate_and_datetime(
+        self, codec_backend: str
+    ) -> None:
+        store = EvidenceStore(max_anchors=10)
+        store.add_anchor(
+            EvidenceAnchor.from_tool_output(
+                "Read", "id_0", {"path": self._PATH, "when": self._WHEN}
+            )
+        )
+        data = store.to_json_bytes()
+        (entry,) = json.loads(data)
+        assert entry["metadata"]["tool_input"] == {
+            "path": self._PATH,
+            "when": str(self._WHEN),
+        }
+        assert json_codec.loads(data) == [entry]
+        buf = io.BytesIO()
+        store.dump_json(buf)
+        assert buf.getvalue() == data
+
+    def test_to_json_bytes_stringifies_non_native_values(
+        self, codec_backend: str
+    ) -> None:
+        store = EvidenceStore(max_anchors=10)
+        store.add_anchor(
+            EvidenceAnchor.from_tool_output(
+                "Read", "id_0", {"when": self._WHEN, "id": uuid.UUID(int=1)}
+            )
+        )
+        (entry,) = json.loads(store.to_json_bytes())
+        assert entry["metadata"]["tool_input"] == {
+            "when": "2024-01-02 03:04:05+00:00",
+            "id": "00000000-0000-0000-0000-000000000001",
+        }
+
+
+class TestNowIso:
+    """Tests for the cached UTC timestamp formatter."""
+
+    @pytest.mark.parametrize(
+        "ns", [1_700_000_000_123_456_789, 1_700_000_000_000_000_000, 0]
+    )
+    def test_matches_datetime_isoformat(
+        self, monkeypatch: pytest.MonkeyPatch, ns: int
+    ) -> None:
+        monkeypatch.setattr(evidence_store.time, "time_ns", lambda: ns)
+        expected = datetime.fromtimestamp(ns // 1000 / 1e6, timezone.utc)
+        assert evidence_store._now_iso() == expected.isoformat()
+
+    def test_prefix_reused_within_second(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        clock = iter([1_700_000_000_000_001_000, 1_700_000_000_999_999_000])
+        monkeypatch.setattr(evidence_store.time, "time_ns", lambda: next(clock))
+        first = evidence_store._now_iso()
+        assert evidence_store._iso_second_cache[0] == 1_700_000_000
+        second = evidence_store._now_iso()
+        assert first[:19] == second[:19]
+        assert second.endswith(".999999+00:00")
+
+    def test_command_ref_uses_compact_timestamp(self) -> None:
+        anchor = EvidenceAnchor.from_command("ls", 0)
+        ref_id = anchor.ref.removeprefix("command:")
+        assert len(ref_id) == 14 and ref_id.isdigit()
+        compact = datetime.fromisoformat(anchor.timestamp).strftime("%Y%m%d%H%M%S")
+        assert ref_id == compact
+
 
 # ─── EvidenceStore API tests ───
 
@@ -198,6 +395,8 @@ class TestEvidenceStoreAPI:
         assert len(store._seq_to_priority) == 0
         assert len(store._by_kind) == 0
         assert len(store._by_capability) == 0
+        assert len(store._seq_to_capability) == 0
+        assert store._sorted_refs == []
 
     def test_clear_then_add_works(self) -> None:
         """Store should accept new anchors after clear()."""
@@ -229,6 +428,75 @@ class TestEvidenceStoreAPI:
             assert "timestamp" in entry
             assert "metadata" in entry
 
+    def test_anchor_kind_is_interned(self) -> None:
+        """Runtime-built kinds share one string object per kind."""
+        kind = "".join(["tool", "_output"])
+        anchor = EvidenceAnchor(ref="r", kind=kind, timestamp="t")
+        assert anchor.kind is sys.intern("tool_output")
+
+    def test_anchor_equality_is_identity(self) -> None:
+        """Anchors compare and hash by identity, not by field values."""
+        first = EvidenceAnchor(ref="r", kind="file", timestamp="t")
+        twin = EvidenceAnchor(ref="r", kind="file", timestamp="t")
+        assert first == first
+        assert first != twin
+        assert len({first, twin}) == 2
+
+    def test_to_list_entries_extend_to_dict(self) -> None:
+        """Each exported entry is to_dict() plus the anchor's metadata."""
+        store = EvidenceStore(max_anchors=10)
+        anchor = EvidenceAnchor.from_file("/tmp/a", "abc")
+        store.add_anchor(anchor)
+        assert store.to_list() == [{**anchor.to_dict(), "metadata": anchor.metadata}]
+
+    def test_to_json_bytes_matches_to_list(self) -> None:
+        """to_json_bytes() should encode the same data as to_list()."""
+        store = EvidenceStore(max_anchors=100)
+        store.add_anchor(
+            EvidenceAnchor.from_tool_output("Read", "id_0", {"path": "/tmp/0"})
+        )
+        store.add_anchor(EvidenceAnchor.from_mutation("file.py", "write", "chk_1"))
+        assert json.loads(store.to_json_bytes()) == store.to_list()
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 512])
+    def test_dump_json_streams_to_list(self, chunk_size: int) -> None:
+        """dump_json() writes the same array as to_list(), in chunks."""
+        store = EvidenceStore(max_anchors=100)
+        for i in range(5):
+            store.add_anchor(
+                EvidenceAnchor.from_tool_output("Read", f"id_{i}", {"n": i})
+            )
+        buf = io.BytesIO()
+        store.dump_json(buf, chunk_size=chunk_size)
+        assert json.loads(buf.getvalue()) == store.to_list()
+        assert list(store.iter_dicts()) == store.to_list()
+
+    def test_dump_json_empty_store(self) -> None:
+        buf = io.BytesIO()
+        EvidenceStore(max_anchors=10).dump_json(buf)
+        assert buf.getvalue() == b"[]"
+
+    def test_add_anchors_matches_sequential_adds(self) -> None:
+        """add_anchors() behaves like add_anchor() called in a loop."""
+        priorities = [PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_LOW]
+
+        def make() -> list[EvidenceAnchor]:
+            return [
+                EvidenceAnchor(ref=f"r:{i}", kind="file", timestamp="t", priority=p)
+                for i, p in enumerate(priorities * 2)
+            ]
+
+        batched = EvidenceStore(max_anchors=5)
+        batched.add_anchors(make(), capability_id="retrieve")
+        looped = EvidenceStore(max_anchors=5)
+        for anchor in make():
+            looped.add_anchor(anchor, capability_id="retrieve")
+
+        assert [a.ref for a in batched] == [a.ref for a in looped]
+        assert batched.get_for_capability_output(
+            "retrieve"
+        ) == looped.get_for_capability_output("retrieve")
+
     def test_to_list_empty_store(self) -> None:
         """to_list() on empty store should return empty list."""
         store = EvidenceStore(max_anchors=100)
@@ -257,6 +525,94 @@ class TestEvidenceStoreAPI:
         results = store.search_by_metadata("tool_name", "NonExistent")
         assert results == []
 
+    def test_search_by_metadata_index_matches_scan(self) -> None:
+        """Indexed keys return the same anchors, in order, as a full scan."""
+        store = EvidenceStore(max_anchors=100)
+        store.add_anchor(EvidenceAnchor.from_command("make", 0, "c0"))
+        store.add_anchor(EvidenceAnchor.from_file("/tmp/a", operation="write"))
+        store.add_anchor(EvidenceAnchor.from_command("make test", 2, "c1"))
+        store.add_anchor(EvidenceAnchor.from_mutation("/tmp/a", "write"))
+        store.add_anchor(
+            EvidenceAnchor(
+                ref="x:1", kind="file", timestamp="t", metadata={"path": ["/tmp/a"]}
+            )
+        )
+
+        def scan(key: str, value: object) -> list[str]:
+            return [a.ref for a in store if a.metadata.get(key) == value]
+
+        for key, value in [
+            ("operation", "write"),
+            ("exit_code", 0),
+            ("exit_code", 2),
+            ("path", "/tmp/a"),
+            ("path", ["/tmp/a"]),
+            ("checkpoint_id", None),
+            ("command", "make"),
+        ]:
+            found = [a.ref for a in store.search_by_metadata(key, value)]
+            assert found == scan(key, value), (key, value)
+
+    def test_indexed_metadata_keys_are_configurable(self) -> None:
+        """Custom indexed keys are served from the index; others are scanned."""
+        store = EvidenceStore(max_anchors=10, indexed_metadata_keys=["region"])
+        store.add_anchor(
+            EvidenceAnchor(
+                ref="r:1", kind="file", timestamp="t", metadata={"region": "eu"}
+            )
+        )
+        store.add_anchor(EvidenceAnchor.from_file("/tmp/a"))
+
+        assert list(store._by_meta) == [("region", "eu")]
+        assert [a.ref for a in store.search_by_metadata("region", "eu")] == ["r:1"]
+        assert [a.ref for a in store.search_by_metadata("path", "/tmp/a")] == [
+            "file:/tmp/a"
+        ]
+
+    def test_evicted_index_buckets_are_dropped(self) -> None:
+        """Kinds and capabilities with no remaining anchors leave no bucket."""
+        store = EvidenceStore(max_anchors=1)
+        store.add_anchor(
+            EvidenceAnchor(ref="a", kind="file", timestamp="t"), capability_id="c1"
+        )
+        store.add_anchor(
+            EvidenceAnchor(ref="b", kind="command", timestamp="t"), capability_id="c2"
+        )
+
+        assert list(store._by_kind) == ["command"]
+        assert list(store._by_capability) == ["c2"]
+        assert store.get_by_kind("file") == []
+        assert store.get_for_capability("c1") == []
+        assert "file" not in store._by_kind
+
+    def test_search_by_metadata_index_follows_eviction(self) -> None:
+        """Evicted anchors are dropped from the metadata index."""
+        store = EvidenceStore(max_anchors=2)
+        for i in range(4):
+            store.add_anchor(EvidenceAnchor.from_command(f"cmd{i}", i % 2, f"c{i}"))
+
+        assert [a.ref for a in store.search_by_metadata("exit_code", 0)] == [
+            "command:c2"
+        ]
+        assert ("exit_code", 0) in store._by_meta
+        store.clear()
+        assert len(store._by_meta) == 0
+
+    def test_metadata_index_uses_insert_time_values(self) -> None:
+        """Indexed metadata is matched as it was when the anchor was added."""
+        store = EvidenceStore(max_anchors=1)
+        anchor = EvidenceAnchor.from_command("make", 0, "c0")
+        store.add_anchor(anchor)
+        anchor.metadata["exit_code"] = 2
+
+        assert store.search_by_metadata("exit_code", 0) == [anchor]
+        assert store.search_by_metadata("exit_code", 2) == []
+
+        # Eviction removes the entry it was indexed under, leaving no bucket
+        store.add_anchor(EvidenceAnchor(ref="x:1", kind="file", timestamp="t"))
+        assert store._by_meta == {}
+        assert store.search_by_metadata("exit_code", 0) == []
+
 
 # ─── SEC-004: Priority eviction tests ───
 
@@ -375,13 +731,64 @@ class TestPriorityEviction:
         store.add_anchor(new)
 
         # Verify index consistency (dict-valued indexes after #63)
+        stored = list(store._seq_to_anchor.values())
         for kind, anchors_dict in store._by_kind.items():
             for a in anchors_dict.values():
-                assert a in store._anchors, f"Stale {a.ref} in _by_kind[{kind}]"
+                assert a in stored, f"Stale {a.ref} in _by_kind[{kind}]"
 
         for cap, anchors_dict in store._by_capability.items():
             for a in anchors_dict.values():
-                assert a in store._anchors, f"Stale {a.ref} in _by_capability[{cap}]"
+                assert a in stored, f"Stale {a.ref} in _by_capability[{cap}]"
+
+    def test_eviction_drops_capability_reverse_mapping(self) -> None:
+        """Evicted anchors leave neither capability index nor reverse map."""
+        store = EvidenceStore(max_anchors=2)
+        for i in range(4):
+            store.add_anchor(
+                EvidenceAnchor(ref=f"r:{i}", kind="file", timestamp=f"t{i}"),
+                capability_id=f"cap{i % 2}",
+            )
+
+        assert set(store._seq_to_capability) == set(store._seq_to_anchor)
+        assert store.get_for_capability_output("cap0") == ["r:2"]
+        assert store.get_for_capability_output("cap1") == ["r:3"]
+
+    def test_search_by_ref_prefix_keeps_insertion_order(self) -> None:
+        """Prefix search returns matches in insertion order, not ref order."""
+        store = EvidenceStore(max_anchors=100)
+        for ref in ["file:b", "tool:Read:1", "file:a", "file:", "filex", "file:c"]:
+            store.add_anchor(EvidenceAnchor(ref=ref, kind="file", timestamp="t"))
+
+        refs = [a.ref for a in store.search_by_ref_prefix("file:")]
+        assert refs == ["file:b", "file:a", "file:", "file:c"]
+        assert len(store.search_by_ref_prefix("")) == 6
+        assert store.search_by_ref_prefix("zzz") == []
+
+    def test_search_by_ref_prefix_skips_evicted(self) -> None:
+        """Evicted anchors disappear from the sorted ref index."""
+        store = EvidenceStore(max_anchors=3)
+        for i in range(5):
+            store.add_anchor(
+                EvidenceAnchor(ref=f"file:{i}", kind="file", timestamp="t")
+            )
+
+        refs = [a.ref for a in store.search_by_ref_prefix("file:")]
+        assert refs == ["file:2", "file:3", "file:4"]
+        assert [ref for ref, _ in store._sorted_refs] == refs
+
+    def test_reassigned_ref_is_evicted_from_prefix_index(self) -> None:
+        store = EvidenceStore(max_anchors=2)
+        first = EvidenceAnchor(ref="file:a", kind="file", timestamp="t")
+        store.add_anchor(first)
+        first.ref = "renamed:a"
+        for i in range(3):
+            store.add_anchor(
+                EvidenceAnchor(ref=f"file:{i}", kind="file", timestamp="t")
+            )
+
+        refs = [a.ref for a in store.search_by_ref_prefix("file:")]
+        assert refs == ["file:1", "file:2"]
+        assert len(store._sorted_refs) == 2
 
 
 # ─── P1-2: Stale index prevention after capacity overflow ───
@@ -412,17 +819,16 @@ class TestNoStaleIndexes:
 
         assert len(store) == cap
 
-        # Every anchor in _by_kind must still exist in _anchors (dict-valued after #63)
+        # Every anchor in _by_kind must still be stored (dict-valued after #63)
+        stored = list(store._seq_to_anchor.values())
         for kind, anchors_dict in store._by_kind.items():
             for a in anchors_dict.values():
-                assert a in store._anchors, f"Stale anchor {a.ref} in _by_kind[{kind}]"
+                assert a in stored, f"Stale anchor {a.ref} in _by_kind[{kind}]"
 
-        # Every anchor in _by_capability must still exist in _anchors (dict-valued after #63)
+        # Every anchor in _by_capability must still be stored (dict-valued after #63)
         for cap_id, anchors_dict in store._by_capability.items():
             for a in anchors_dict.values():
-                assert a in store._anchors, (
-                    f"Stale anchor {a.ref} in _by_capability[{cap_id}]"
-                )
+                assert a in stored, f"Stale anchor {a.ref} in _by_capability[{cap_id}]"
 
 
 # ─── TEST-003: Performance benchmarks ───
@@ -607,3 +1013,20 @@ class TestEvictionEdgeCases:
         refs = [a.ref for a in store]
         assert "crit:0" not in refs  # Oldest critical evicted
         assert "crit:3" in refs  # Newest survived
+
+    def test_mid_store_eviction_preserves_insertion_order(self) -> None:
+        """Evicting a victim behind older high-priority anchors keeps order."""
+        store = EvidenceStore(max_anchors=4)
+        priorities = [PRIORITY_HIGH, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL]
+        for i, priority in enumerate(priorities):
+            store.add_anchor(
+                EvidenceAnchor(
+                    ref=f"a:{i}", kind="file", timestamp=f"t{i}", priority=priority
+                )
+            )
+
+        store.add_anchor(EvidenceAnchor(ref="a:4", kind="file", timestamp="t4"))
+
+        assert [a.ref for a in store] == ["a:0", "a:1", "a:3", "a:4"]
+        assert store.get_recent(2) == ["a:3", "a:4"]
+        assert store.get_recent(0) == []
@@ -0,0 +1,96 @@
+"""Tests for the state-file JSON codec (orjson with stdlib fallback)."""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from types import ModuleType
+
+import pytest
+
+from grounded_agency.utils import json_codec
+
+
+class _Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class _Point:
+    x: int
+
+
+# Values the two backends encode differently unless the codec aligns them.
+_MIXED: dict[str, object] = {
+    "when": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "id": uuid.UUID(int=1),
+    "color": _Color.RED,
+    "point": _Point(1),
+}
+_MIXED_ENCODED = (
+    b'{"when":"2024-01-02 03:04:05+00:00",'
+    b'"id":"00000000-0000-0000-0000-000000000001",'
+    b'"color":"red","point":"_Point(x=1)"}'
+)
+
+
+@pytest.fixture
+def stdlib_codec(monkeypatch: pytest.MonkeyPatch) -> Iterator[ModuleType]:
+    """Reload the codec with orjson hidden to exercise the fallback."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    module = importlib.reload(json_codec)
+    yield module
+    monkeypatch.undo()
+    importlib.reload(json_codec)
+
+
+class TestJsonCodec:
+    """Both backends must produce interchangeable UTF-8 JSON bytes."""
+
+    def test_round_trip(self) -> None:
+        state = {"active": None, "history": [{"id": "chk_1", "scope": ["*"]}]}
+        data = json_codec.dumps(state)
+        assert isinstance(data, bytes)
+        assert json_codec.loads(data) == state
+        assert json.loads(data) == state
+
+    def test_non_ascii_is_utf8(self) -> None:
+        data = json_codec.dumps({"reason": "café"})
+        assert "café".encode() in data
+
+    def test_lone_surrogate_is_escaped(self) -> None:
+        path = os.fsdecode(b"src/\xff.py")
+        data = json_codec.dumps({"scope": [path]})
+        assert data == b'{"scope":["src/\\udcff.py"]}'
+        assert json_codec.loads(data) == {"scope": [path]}
+        assert json.loads(data) == {"scope": [path]}
+
+    def test_unserializable_raises_type_error(self) -> None:
+        with pytest.raises(TypeError):
+            json_codec.dumps({"obj": object()})
+
+    def test_malformed_raises_decode_error(self) -> None:
+        with pytest.raises(json_codec.JSONDecodeError):
+            json_codec.loads(b"{not json")
+
+    def test_non_native_values_use_default(self) -> None:
+        assert json_codec.dumps(_MIXED, default=str) == _MIXED_ENCODED
+
+    def test_stdlib_fallback_matches(self, stdlib_codec: ModuleType) -> None:
+        assert not stdlib_codec.HAVE_ORJSON
+        state = {"history": [{"id": "chk_1", "reason": "café"}], "n": 1}
+        assert stdlib_codec.loads(stdlib_codec.dumps(state)) == state
+        path = os.fsdecode(b"src/\xff.py")
+        assert stdlib_codec.dumps([path]) == b'["src/\\udcff.py"]'
+        with pytest.raises(stdlib_codec.JSONDecodeError):
+            stdlib_codec.loads(b"{not json")
+
+    def test_stdlib_fallback_non_native_values(self, stdlib_codec: ModuleType) -> None:
+        assert stdlib_codec.dumps(_MIXED, default=str) == _MIXED_ENCODED
@@ -182,6 +182,21 @@ class TestConcurrentAllow:
         # Medium: 10 capacity, so exactly 10 allowed
         assert medium_allowed == 10, f"Medium: expected 10, got {medium_allowed}"
 
+    def test_risk_levels_do_not_share_a_lock(self) -> None:
+        """A caller holding one bucket must not block other risk levels."""
+        import threading
+
+        limiter = RateLimiter()
+        done = threading.Event()
+
+        def medium_worker() -> None:
+            limiter.allow("medium")
+            done.set()
+
+        with limiter._buckets["high"].lock:
+            threading.Thread(target=medium_worker).start()
+            assert done.wait(timeout=5.0)
+
 
 class TestGetRemaining:
     """Tests for diagnostics."""
@@ -196,6 +211,25 @@ class TestGetRemaining:
         remaining = default_limiter.get_remaining("high")
         assert remaining < 15.0
 
+    def test_refill_is_exact(
+        self, monkeypatch: pytest.MonkeyPatch, strict_limiter: RateLimiter
+    ) -> None:
+        """Fixed-point refill credits whole tokens without rounding drift."""
+        clock = [10**12]
+        monkeypatch.setattr(time, "monotonic_ns", lambda: clock[0])
+        strict_limiter.reset()
+        for _ in range(3):
+            assert strict_limiter.allow("high") is True
+        assert strict_limiter.allow("high") is False
+
+        # 3 RPM: one token every 20 s, credited in many small steps
+        for _ in range(20_000):
+            clock[0] += 1_000_000
+            strict_limiter.get_remaining("high")
+        assert strict_limiter.get_remaining("high") == 1.0
+        assert strict_limiter.allow("high") is True
+        assert strict_limiter.allow("high") is False
+
     def test_unknown_level_returns_zero(self, default_limiter: RateLimiter) -> None:
         assert default_limiter.get_remaining("unknown") == 0.0
 
@@ -87,6 +87,19 @@ class TestSafeYamlLoad:
         with pytest.raises(YAMLSizeExceededError, match=r"limit.*1 bytes"):
             safe_yaml_load(small_yaml, max_size=1)
 
+    def test_rejects_python_object_tags(self, tmp_path: Path) -> None:
+        """The (C or pure-Python) safe loader must refuse arbitrary objects."""
+        p = tmp_path / "unsafe.yaml"
+        p.write_text("x: !!python/object/apply:os.getcwd []\n", encoding="utf-8")
+        with pytest.raises(yaml.YAMLError):
+            safe_yaml_load(p)
+
+    @pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml not available")
+    def test_uses_libyaml_loader_when_available(self) -> None:
+        from grounded_agency.utils import safe_yaml
+
+        assert safe_yaml._SafeLoader is yaml.CSafeLoader
+
 
 class TestSymlinkRejection:
     """Tests for symlink rejection (SEC-006)."""
@@ -19,6 +19,8 @@ import pytest
 
 from grounded_agency.errors import ErrorCode, ValidationError
 from grounded_agency.state.checkpoint_tracker import CheckpointTracker
+from grounded_agency.utils import json_codec
+from grounded_agency.workflows import engine as engine_module
 from grounded_agency.workflows.engine import (
     BindingError,
     WorkflowDefinition,
@@ -116,6 +118,57 @@ class TestWorkflowLoading:
         assert "plan" in wf.inputs
 
 
+class TestCatalogCache:
+    """Parsed catalogs are reused until the file changes."""
+
+    def _write_catalog(self, path: Path, goal: str) -> None:
+        path.write_text(
+            f"wf:\n  goal: {goal}\n  inputs:\n    x: {{}}\n"
+            "  steps:\n    - capability: search\n      purpose: p\n",
+            encoding="utf-8",
+        )
+
+    def test_unchanged_catalog_skips_yaml_parse(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        catalog = tmp_path / "catalog.yaml"
+        self._write_catalog(catalog, "first")
+        WorkflowEngine(ONTOLOGY_PATH).load_catalog(catalog)
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("catalog should come from the cache")
+
+        monkeypatch.setattr(engine_module, "safe_yaml_load", fail)
+        eng = WorkflowEngine(ONTOLOGY_PATH)
+        assert eng.load_catalog(catalog) == 1
+        wf = eng.get_workflow("wf")
+        assert wf is not None and wf.goal == "first"
+
+    def test_modified_catalog_is_reparsed(self, tmp_path: Path) -> None:
+        catalog = tmp_path / "catalog.yaml"
+        self._write_catalog(catalog, "first")
+        WorkflowEngine(ONTOLOGY_PATH).load_catalog(catalog)
+
+        self._write_catalog(catalog, "second, longer")
+        eng = WorkflowEngine(ONTOLOGY_PATH)
+        eng.load_catalog(catalog)
+        wf = eng.get_workflow("wf")
+        assert wf is not None and wf.goal == "second, longer"
+
+    def test_cached_loads_do_not_share_objects(self, tmp_path: Path) -> None:
+        catalog = tmp_path / "catalog.yaml"
+        self._write_catalog(catalog, "first")
+        first = WorkflowEngine(ONTOLOGY_PATH)
+        first.load_catalog(catalog)
+        second = WorkflowEngine(ONTOLOGY_PATH)
+        second.load_catalog(catalog)
+
+        wf1, wf2 = first.get_workflow("wf"), second.get_workflow("wf")
+        assert wf1 is not None and wf2 is not None
+        wf1.inputs["x"]["mutated"] = True
+        assert wf2.inputs == {"x": {}}
+
+
 class TestStepParsing:
     """Verify step fields are parsed correctly."""
 
@@ -204,6 +257,31 @@ class TestStepParsing:
         assert "observe_out" in names
         assert "execute_out" in names
 
+    def test_derived_views_follow_steps(self) -> None:
+        wf = WorkflowDefinition(
+            name="direct",
+            goal="test",
+            risk="low",
+            steps=[
+                WorkflowStep(capability="observe", purpose="p", store_as="obs"),
+                WorkflowStep(
+                    capability="mutate",
+                    purpose="p",
+                    mutation=True,
+                    requires_checkpoint=True,
+                    store_as="out",
+                ),
+            ],
+        )
+        assert [s.capability for s in wf.mutation_steps] == ["mutate"]
+        assert wf.checkpoint_required_steps == wf.mutation_steps
+        assert wf.store_as_names == {"obs", "out"}
+
+        wf.steps = [WorkflowStep(capability="observe", purpose="p")]
+        assert wf.mutation_steps == []
+        assert wf.checkpoint_required_steps == []
+        assert wf.store_as_names == set()
+
 
 # ---------------------------------------------------------------------------
 # AC1: Capability validation
@@ -306,6 +384,14 @@ class TestValidationModeTracing:
         assert 1 in report.skipped_steps
         assert len(report.matched_steps) >= 2
 
+    def test_skipped_status_compares_by_value(self, engine: WorkflowEngine) -> None:
+        tracer = WorkflowTracer(engine, "debug_code_change")
+        tracer.mark_step_skipped(1)
+        # A status restored from serialized form is the plain string value.
+        tracer.traces[0].status = "skipped"  # type: ignore[assignment]
+
+        assert tracer.get_report().skipped_steps == [1]
+
     def test_invalid_workflow_raises(self, engine: WorkflowEngine) -> None:
         with pytest.raises(ValueError, match="Workflow not found"):
             WorkflowTracer(engine, "nonexistent")
@@ -346,6 +432,15 @@ class TestValidationModeTracing:
 class TestBindingValidation:
     """AC3: Binding mismatches between steps detected and reported."""
 
+    def test_types_compatible_aliases(self) -> None:
+        eng = WorkflowEngine(ONTOLOGY_PATH)
+        assert eng._types_compatible("array", "list<object>")
+        assert eng._types_compatible("Array", "array[string]")
+        assert eng._types_compatible("integer", "Number")
+        assert not eng._types_compatible("string", "int")
+        assert eng._types_compatible("uri", "URI")
+        assert not eng._types_compatible("uri", "string")
+
     def test_real_workflows_bindings_valid(self, engine: WorkflowEngine) -> None:
         """All real workflows should have resolvable bindings."""
         for name in engine.list_workflows():
@@ -598,6 +693,37 @@ class TestEdgeConstraintValidation:
         assert len(errors) == 1
         assert "not found" in errors[0]
 
+    def test_edge_lookups_cached_per_capability(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        eng = WorkflowEngine(ONTOLOGY_PATH)
+        calls: list[str] = []
+        original = eng.registry.get_required_capabilities
+
+        def counting(cap_id: str) -> list[str]:
+            calls.append(cap_id)
+            return original(cap_id)
+
+        monkeypatch.setattr(eng.registry, "get_required_capabilities", counting)
+        for name in ("a", "b"):
+            eng._workflows[name] = WorkflowDefinition(
+                name=name,
+                goal="test",
+                risk="low",
+                steps=[
+                    WorkflowStep(capability="mutate", purpose="test"),
+                    WorkflowStep(capability="checkpoint", purpose="test"),
+                    WorkflowStep(capability="mutate", purpose="test"),
+                ],
+            )
+            errors = eng.validate_edge_constraints(name)
+            assert errors[0] == (
+                "Step 0 (mutate): requires 'checkpoint' "
+                "but it hasn't been executed in prior steps"
+            )
+            assert not any(e.startswith("Step 2 (mutate): requires") for e in errors)
+        assert sorted(calls) == ["checkpoint", "mutate"]
+
 
 # ---------------------------------------------------------------------------
 # validate_all
@@ -617,6 +743,11 @@ class TestValidateAll:
         for key in results:
             assert key in known
 
+    def test_validate_all_json_round_trips(self, engine: WorkflowEngine) -> None:
+        encoded = engine.validate_all_json()
+        assert isinstance(encoded, bytes)
+        assert json_codec.loads(encoded) == engine.validate_all()
+
 
 # ---------------------------------------------------------------------------
 # validate_all_structured
@@ -681,6 +812,54 @@ class TestValidateAllStructured:
         assert set(structured.keys()) == set(plain.keys())
 
 
+class TestValidationCache:
+    """Validator results are reused while a workflow definition is unchanged."""
+
+    def test_repeated_validate_all_reuses_results(
+        self, engine: WorkflowEngine, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        first = engine.validate_all()
+        calls = 0
+        original = engine.registry.get_capability
+
+        def counting(cap_id: str) -> Any:
+            nonlocal calls
+            calls += 1
+            return original(cap_id)
+
+        monkeypatch.setattr(engine.registry, "get_capability", counting)
+        assert engine.validate_all() == first
+        assert calls == 0
+
+    def test_returned_lists_are_copies(self, engine: WorkflowEngine) -> None:
+        name = engine.list_workflows()[0]
+        engine.validate_capabilities(name).append("junk")
+        assert "junk" not in engine.validate_capabilities(name)
+
+    def test_replaced_definition_is_revalidated(self) -> None:
+        eng = WorkflowEngine(ONTOLOGY_PATH)
+        eng._workflows["wf"] = WorkflowDefinition(
+            name="wf",
+            goal="test",
+            risk="low",
+            steps=[WorkflowStep(capability="observe", purpose="test")],
+        )
+        assert eng.validate_capabilities("wf") == []
+        eng._workflows["wf"] = WorkflowDefinition(
+            name="wf",
+            goal="test",
+            risk="low",
+            steps=[WorkflowStep(capability="nonexistent_cap", purpose="test")],
+        )
+        assert len(eng.validate_capabilities("wf")) == 1
+
+    def test_load_catalog_clears_cache(self, engine: WorkflowEngine) -> None:
+        engine.validate_all()
+        assert engine._validation_cache
+        engine.load_catalog(CATALOG_PATH)
+        assert not engine._validation_cache
+
+
 # ---------------------------------------------------------------------------
 # BindingError.error_code
 # ---------------------------------------------------------------------------
@@ -953,6 +1132,86 @@ class TestBindingTraversalLimits:
                 # Should not raise
                 engine._extract_binding_refs(step.input_bindings)
 
+    def test_refs_in_document_order(self) -> None:
+        bindings = {
+            "a": "${x} ${y: string}",
+            "b": [{"c": "${z.w}"}, "${v}"],
+            "d": "${u}",
+        }
+        refs = WorkflowEngine._extract_binding_refs(bindings)
+        assert refs == [
+            ("a", "x", None),
+            ("a", "y", "string"),
+            ("b[0].c", "z.w", None),
+            ("b[1]", "v", None),
+            ("d", "u", None),
+        ]
+
+    def test_refs_do_not_span_string_leaves(self) -> None:
+        bindings = {"a": "${x:", "b": "string}", "c": ["${", "y}"], "d": "${z}"}
+        refs = WorkflowEngine._extract_binding_refs(bindings)
+        assert refs == [("d", "z", None)]
+
+    def test_step_refs_extracted_once(self) -> None:
+        step = WorkflowStep(
+            capability="search",
+            purpose="test",
+            input_bindings={"q": "${obs_out.items: array}", "n": ["${limit}"]},
+        )
+        refs = step._binding_refs()
+        assert refs == (
+            ("q", "obs_out.items", "obs_out", "array"),
+            ("n[0]", "limit", "limit", None),
+        )
+        assert step._binding_refs() is refs
+
+    def test_binding_names_are_interned(self) -> None:
+        wf = WorkflowDefinition.from_dict(
+            "wf",
+            {
+                "inputs": {"".join(["q", "uery"]): {}},
+                "steps": [
+                    {"capability": "observe", "store_as": "".join(["ob", "s"])},
+                    {
+                        "capability": "search",
+                        "input_bindings": {"q": "${obs.x} ${query}"},
+                    },
+                ],
+            },
+        )
+        refs = wf.steps[1]._binding_refs()
+        assert refs[0][2] is wf.steps[0].store_as
+        assert refs[1][2] is next(iter(wf.inputs))
+
+    def test_step_refs_follow_reassigned_bindings(self) -> None:
+        step = WorkflowStep(
+            capability="search", purpose="test", input_bindings={"q": "${a}"}
+        )
+        assert step._binding_refs()[0][1] == "a"
+        step.input_bindings = {"q": "${b}"}
+        assert step._binding_refs()[0][1] == "b"
+
+    def test_validate_bindings_raises_on_deep_step_bindings(self) -> None:
+        eng = WorkflowEngine(ONTOLOGY_PATH)
+        bindings: dict[str, Any] = {"val": "${leaf_ref}"}
+        for i in range(60):
+            bindings = {f"level_{i}": bindings}
+        eng._workflows["deep"] = WorkflowDefinition(
+            name="deep",
+            goal="test",
+            risk="low",
+            steps=[
+                WorkflowStep(capability="search", purpose="t", input_bindings=bindings)
+            ],
+        )
+        with pytest.raises(ValueError, match="max depth"):
+            eng.validate_bindings("deep")
+        # The other validators share the same analysis pass but still report.
+        assert eng.validate_capabilities("deep") == []
+        assert isinstance(eng.validate_edge_constraints("deep"), list)
+        with pytest.raises(ValueError, match="max depth"):
+            eng.validate_bindings("deep")
+
 
 # ---------------------------------------------------------------------------
 # SEC-P1-1: Runtime checkpoint enforcement despite YAML downgrade
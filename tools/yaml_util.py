@@ -23,6 +23,10 @@ import yaml
 DEFAULT_MAX_BYTES: int = 1 * 1024 * 1024  # 1 MB
 ONTOLOGY_MAX_BYTES: int = 10 * 1024 * 1024  # 10 MB
 
+# libyaml's C loader parses several times faster; it resolves the same
+# safe tag set as the pure-Python SafeLoader it falls back to.
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class YAMLSizeExceededError(Exception):
     """Raised when a YAML file exceeds the allowed size limit."""
@@ -81,7 +85,7 @@ def safe_yaml_load(
             file_size = os.fstat(f.fileno()).st_size
             if file_size > max_size:
                 raise YAMLSizeExceededError(path, file_size, max_size)
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_SafeLoader)
     else:
         # Fallback for platforms without O_NOFOLLOW
         if path.is_symlink():
@@ -90,4 +94,4 @@ def safe_yaml_load(
             file_size = os.fstat(f.fileno()).st_size
             if file_size > max_size:
                 raise YAMLSizeExceededError(path, file_size, max_size)
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_SafeLoader)